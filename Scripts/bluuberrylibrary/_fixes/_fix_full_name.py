@@ -10,7 +10,7 @@ from bluuberrylibrary.utils.debug.bb_injection_utils import BBInjectionUtils
 from sims.sim_info import SimInfo
 
 
-@BBInjectionUtils.inject(ModIdentity(), SimInfo, 'full_name')
+@BBInjectionUtils.inject(ModIdentity(), SimInfo, 'full_name', cache_keys=('first_name', 'last_name'))
 def _fix_full_name(original_fun, self: SimInfo, *_, **__):
     original_value = original_fun(self, *_, **__)
     if original_value == '':
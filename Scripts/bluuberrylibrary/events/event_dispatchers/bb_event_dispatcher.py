@@ -5,6 +5,8 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
+from typing import Type
+
 from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.classes.bb_singleton import BBSingleton
 from bluuberrylibrary.events.event_handling.bb_event import BBEvent
@@ -14,6 +16,20 @@ from event_testing.results import TestResult
 class BBEventDispatcher(metaclass=BBSingleton):
     """Dispatches events to :class:`.BBEventHandlerRegistry`"""
 
+    # noinspection PyMethodMayBeStatic
+    def has_event_handlers(self, event_type: Type[BBEvent]) -> bool:
+        """has_event_handlers(event_type)
+
+        Determine if any handlers are listening for events of a type.
+
+        :param event_type: The type of event.
+        :type event_type: Type[BBEvent]
+        :return: True, if at least one handler is listening for events of the specified type. False, if not.
+        :rtype: bool
+        """
+        from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+        return BBEventHandlerRegistry().has_event_handlers(event_type)
+
     # noinspection PyMethodMayBeStatic
     def dispatch(self, event: BBEvent) -> BBRunResult:
         """dispatch(event)
@@ -14,7 +14,6 @@ from bluuberrylibrary.events.event_dispatchers.zone.events.bb_on_zone_load_end_e
 from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
 from bluuberrylibrary.mod_identity import ModIdentity
 from event_testing.test_events import TestEvent
-from interactions import ParticipantType
 
 
 class BBInteractionEventDispatcher(BBEventDispatcher):
@@ -26,9 +25,9 @@ class BBInteractionEventDispatcher(BBEventDispatcher):
 
     def handle_event(self, sim_info, event, resolver):
         if event == TestEvent.InteractionComplete:
-            interaction = resolver.interaction
-            target_object = resolver.get_participant(ParticipantType.Object)
-            self.dispatch(BBOnInteractionCompletedEvent(ModIdentity(), sim_info, interaction, target_object))
+            if not self.has_event_handlers(BBOnInteractionCompletedEvent):
+                return
+            self.dispatch(BBOnInteractionCompletedEvent(ModIdentity(), sim_info, resolver.interaction, resolver=resolver))
 
 
 @BBEventHandlerRegistry.register(ModIdentity(), BBOnZoneLoadEndEvent)
@@ -5,7 +5,7 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
-from typing import Union
+from typing import Union, Any
 
 from bluuberrylibrary.events.event_handling.bb_event import BBEvent
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
@@ -14,13 +14,17 @@ from objects.game_object import GameObject
 from sims.sim import Sim
 from sims.sim_info import SimInfo
 
+# Marks the target as not yet resolved, since None is a valid target.
+_UNRESOLVED = object()
+
 
 class BBOnInteractionCompletedEvent(BBEvent):
     """BBOnInteractionCompletedEvent(\
         mod_identity,\
         sim_info,\
         interaction,\
-        target\
+        target=None,\
+        resolver=None\
     )
 
     An event that occurs when a Sim finished performing an interaction.
@@ -47,17 +51,19 @@ class BBOnInteractionCompletedEvent(BBEvent):
     :type sim_info: SimInfo
     :param interaction: The interaction that was completed.
     :type interaction: Interaction
-    :param target: The target of the interaction.
-    :type target: GameObject or Sim
+    :param target: The target of the interaction. Default is None.
+    :type target: GameObject or Sim, optional
+    :param resolver: A resolver used to look up the target the first time it is accessed, when no target is specified. The target is looked up right away for handlers with a delivery mode of DEFERRED, before the interaction is torn down. Default is None.
+    :type resolver: Any, optional
     """
-    def __init__(self, mod_identity: BBModIdentity, sim_info: SimInfo, interaction: Interaction, target: Union[GameObject, Sim]):
+    __slots__ = ('_sim_info', '_interaction', '_target', '_resolver')
+
+    def __init__(self, mod_identity: BBModIdentity, sim_info: SimInfo, interaction: Interaction, target: Union[GameObject, Sim] = None, resolver: Any = None):
         super().__init__(mod_identity)
         self._sim_info = sim_info
         self._interaction = interaction
-        if target is not None and isinstance(target, Sim):
-            from bluuberrylibrary.utils.sims.bb_sim_utils import BBSimUtils
-            target = BBSimUtils.to_sim_info(target)
-        self._target = target
+        self._target = _UNRESOLVED if target is None and resolver is not None else target
+        self._resolver = resolver
 
     @property
     def sim_info(self) -> SimInfo:
@@ -70,9 +76,26 @@ class BBOnInteractionCompletedEvent(BBEvent):
         return self._interaction
 
     @property
-    def target(self) -> Union[GameObject, Sim]:
-        """The target of the interaction."""
-        return self._target
+    def target(self) -> Union[GameObject, SimInfo]:
+        """The target of the interaction. Sims are provided as their SimInfo."""
+        target = self._target
+        if target is _UNRESOLVED:
+            from interactions import ParticipantType
+            target = self._resolver.get_participant(ParticipantType.Object)
+            self._resolver = None
+        if target is not None and isinstance(target, Sim):
+            from bluuberrylibrary.utils.sims.bb_sim_utils import BBSimUtils
+            target = BBSimUtils.to_sim_info(target)
+        self._target = target
+        return target
+
+    def resolve_lazy_fields(self) -> None:
+        """resolve_lazy_fields()
+
+        Look up the target of the interaction while the resolver can still provide it.
+        """
+        if self._target is _UNRESOLVED:
+            _ = self.target
 
     @property
     def was_user_cancelled(self) -> bool:
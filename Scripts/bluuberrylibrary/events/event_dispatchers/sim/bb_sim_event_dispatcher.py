@@ -5,7 +5,8 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
-from typing import Union, Any
+import time
+from typing import Union, Any, Dict, Tuple, Type, Callable
 
 from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.classes.bb_test_result import BBTestResult
@@ -14,20 +15,107 @@ from bluuberrylibrary.events.event_dispatchers.sim.events.bb_on_sim_despawned_ev
 from bluuberrylibrary.events.event_dispatchers.sim.events.bb_on_sim_died_event import BBOnSimDiedEvent
 from bluuberrylibrary.events.event_dispatchers.sim.events.bb_on_sim_resurrected_event import BBOnSimResurrectedEvent
 from bluuberrylibrary.events.event_dispatchers.sim.events.bb_on_sim_spawned_event import BBOnSimSpawnedEvent
+from bluuberrylibrary.events.event_handling.bb_event import BBEvent
 from bluuberrylibrary.mod_identity import ModIdentity
 from bluuberrylibrary.utils.debug.bb_injection_utils import BBInjectionUtils
 from bluuberrylibrary.utils.sims.bb_sim_utils import BBSimUtils
 from interactions.utils.death import DeathTracker, DeathType
 from sims.sim import Sim
 from sims.sim_info import SimInfo
-from sims.sim_spawner import SimSpawner
+from zone import Zone
 
 
 class BBSimEventDispatcher(BBEventDispatcher):
-    """Dispatches event related to Sims"""
+    """Dispatches event related to Sims
+
+    .. note::
+
+        While lifecycle coalescing is enabled, spawn and despawn events are held for a short window and only the net change of each Sim is dispatched.
+        A Sim that spawns and despawns (or despawns and spawns again) within the window produces no event, and repeated events for the same Sim produce a single event.
+        Held events are always dispatched when a Zone finishes loading and before it unloads.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            BBSimEventDispatcher().enable_lifecycle_coalescing(window_seconds=1.0)
+
+    """
 
     def __init__(self):
         super().__init__()
+        self._lifecycle_coalescing_window: Union[float, None] = None
+        self._lifecycle_coalescing_window_end = 0.0
+        self._clock: Callable[[], float] = time.monotonic
+        # The net lifecycle event of each Sim held during the current window, keyed by Sim id.
+        self._pending_lifecycle_events: Dict[int, Tuple[Type[BBEvent], SimInfo]] = dict()
+
+    @property
+    def is_coalescing_lifecycle_events(self) -> bool:
+        """True, if spawn and despawn events are being coalesced. False, if they are dispatched as they occur."""
+        return self._lifecycle_coalescing_window is not None
+
+    def enable_lifecycle_coalescing(self, window_seconds: float = 0.5, clock: Callable[[], float] = time.monotonic) -> None:
+        """enable_lifecycle_coalescing(window_seconds=0.5, clock=time.monotonic)
+
+        Hold Sim spawn and despawn events and dispatch only the net change of each Sim once the window has passed.
+
+        :param window_seconds: The number of real seconds events are held for, starting from the first held event. Default is 0.5.
+        :type window_seconds: float, optional
+        :param clock: A function returning the current time in seconds. Default is time.monotonic.
+        :type clock: Callable[[], float], optional
+        """
+        self._lifecycle_coalescing_window = window_seconds
+        self._clock = clock
+
+    def disable_lifecycle_coalescing(self) -> BBRunResult:
+        """disable_lifecycle_coalescing()
+
+        Dispatch any held events and go back to dispatching spawn and despawn events as they occur.
+
+        :return: The result of dispatching the held events.
+        :rtype: BBRunResult
+        """
+        self._lifecycle_coalescing_window = None
+        return self.flush_lifecycle_events()
+
+    def flush_lifecycle_events(self) -> BBRunResult:
+        """flush_lifecycle_events()
+
+        Dispatch the net spawn and despawn events held while coalescing.
+
+        :return: The result of dispatching the events. True, if successful. False, if not.
+        :rtype: BBRunResult
+        """
+        if not self._pending_lifecycle_events:
+            return BBRunResult.TRUE
+        pending_lifecycle_events = self._pending_lifecycle_events
+        self._pending_lifecycle_events = dict()
+        all_success = BBRunResult.TRUE
+        for (event_type, sim_info) in pending_lifecycle_events.values():
+            if not self.has_event_handlers(event_type):
+                continue
+            result = self.dispatch(event_type(ModIdentity(), sim_info))
+            if not result:
+                all_success = result
+        return all_success
+
+    def _on_zone_update(self) -> None:
+        if self._pending_lifecycle_events and self._clock() >= self._lifecycle_coalescing_window_end:
+            self.flush_lifecycle_events()
+
+    def _coalesce_lifecycle_event(self, event_type: Type[BBEvent], sim_info: SimInfo) -> BBRunResult:
+        sim_id = sim_info.sim_id
+        pending_lifecycle_event = self._pending_lifecycle_events.get(sim_id, None)
+        if pending_lifecycle_event is None:
+            if not self._pending_lifecycle_events:
+                self._lifecycle_coalescing_window_end = self._clock() + self._lifecycle_coalescing_window
+            self._pending_lifecycle_events[sim_id] = (event_type, sim_info)
+        elif pending_lifecycle_event[0] is event_type:
+            self._pending_lifecycle_events[sim_id] = (event_type, sim_info)
+        else:
+            # A spawn and a despawn of the same Sim cancel each other out.
+            del self._pending_lifecycle_events[sim_id]
+        return BBRunResult.TRUE
 
     def on_sim_spawned(self, sim_info: SimInfo) -> BBRunResult:
         """on_sim_spawned(sim_info)
@@ -37,6 +125,10 @@ class BBSimEventDispatcher(BBEventDispatcher):
         :return: The result of dispatching the event. True, if successful. False, if not.
         :rtype: BBTestResult
         """
+        if self._lifecycle_coalescing_window is not None:
+            return self._coalesce_lifecycle_event(BBOnSimSpawnedEvent, sim_info)
+        if not self.has_event_handlers(BBOnSimSpawnedEvent):
+            return BBRunResult.TRUE
         event = BBOnSimSpawnedEvent(ModIdentity(), sim_info)
         return self.dispatch(event)
 
@@ -48,6 +140,10 @@ class BBSimEventDispatcher(BBEventDispatcher):
         :return: The result of dispatching the event. True, if successful. False, if not.
         :rtype: BBTestResult
         """
+        if self._lifecycle_coalescing_window is not None:
+            return self._coalesce_lifecycle_event(BBOnSimDespawnedEvent, sim_info)
+        if not self.has_event_handlers(BBOnSimDespawnedEvent):
+            return BBRunResult.TRUE
         event = BBOnSimDespawnedEvent(ModIdentity(), sim_info)
         return self.dispatch(event)
 
@@ -59,6 +155,8 @@ class BBSimEventDispatcher(BBEventDispatcher):
         :return: The result of dispatching the event. True, if successful. False, if not.
         :rtype: BBTestResult
         """
+        if not self.has_event_handlers(BBOnSimDiedEvent):
+            return BBRunResult.TRUE
         event = BBOnSimDiedEvent(ModIdentity(), sim_info)
         return self.dispatch(event)
 
@@ -70,21 +168,24 @@ class BBSimEventDispatcher(BBEventDispatcher):
         :return: The result of dispatching the event. True, if successful. False, if not.
         :rtype: BBTestResult
         """
+        if not self.has_event_handlers(BBOnSimResurrectedEvent):
+            return BBRunResult.TRUE
         event = BBOnSimResurrectedEvent(ModIdentity(), sim_info)
         return self.dispatch(event)
 
 
-@BBInjectionUtils.inject(ModIdentity(), SimSpawner, SimSpawner.spawn_sim.__name__, log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), 'sims.sim_spawner.SimSpawner.spawn_sim', log_errors=False, fast_path=True)
 def _bbl_on_sim_spawned(original, cls, sim_info, *args, **kwargs):
-    result = original(sim_info, *args, **kwargs)
+    result = original(cls, sim_info, *args, **kwargs)
     BBSimEventDispatcher().on_sim_spawned(sim_info)
     return result
 
 
 @BBInjectionUtils.inject(ModIdentity(), Sim, Sim.destroy.__name__, log_errors=False)
 def _bbl_on_sim_despawned(original, self, *args, **kwargs):
-    sim_info = BBSimUtils.to_sim_info(self)
-    BBSimEventDispatcher().on_sim_despawned(sim_info)
+    if BBSimEventDispatcher().is_coalescing_lifecycle_events or BBSimEventDispatcher().has_event_handlers(BBOnSimDespawnedEvent):
+        sim_info = BBSimUtils.to_sim_info(self)
+        BBSimEventDispatcher().on_sim_despawned(sim_info)
     result = original(self, *args, **kwargs)
     return result
 
@@ -102,3 +203,11 @@ def _bbl_on_sim_set_death_type(original, self, death_type: Union[DeathType, None
     elif previous_death_type is None or previous_death_type == DeathType.NONE:
         BBSimEventDispatcher().on_sim_died(sim_info)
     return original_result
+
+
+@BBInjectionUtils.inject(ModIdentity(), Zone, Zone.update.__name__, log_errors=False)
+def _bbl_on_zone_update_flush_sim_lifecycle_events(original, self: Zone, *args, **kwargs):
+    result = original(self, *args, **kwargs)
+    BBSimEventDispatcher()._on_zone_update()
+    return result
+
@@ -36,6 +36,8 @@ class BBOnSimSpawnedEvent(BBEvent):
     :param sim_info: The info of a Sim.
     :type sim_info: SimInfo
     """
+    __slots__ = ('_sim_info',)
+
     def __init__(self, mod_identity: BBModIdentity, sim_info: SimInfo):
         super().__init__(mod_identity)
         self._sim_info = sim_info
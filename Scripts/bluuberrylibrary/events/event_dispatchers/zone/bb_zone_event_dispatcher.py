@@ -7,6 +7,9 @@ Copyright (c) BLUUBERRYBONANZA
 """
 from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.events.event_dispatchers.bb_event_dispatcher import BBEventDispatcher
+from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+from bluuberrylibrary.logs.bb_error_aggregator import BBErrorAggregator
+from bluuberrylibrary.logs.bb_log_writer import BBLogWriter
 from bluuberrylibrary.mod_identity import ModIdentity
 from bluuberrylibrary.utils.debug.bb_injection_utils import BBInjectionUtils
 from server.client import Client
@@ -45,9 +48,15 @@ class BBZoneEventDispatcher(BBEventDispatcher):
         :return: The result of dispatching the event. True, if successful. False, if not.
         :rtype: BBRunResult
         """
+        # Handlers see every Sim that spawned during the load.
+        from bluuberrylibrary.events.event_dispatchers.sim.bb_sim_event_dispatcher import BBSimEventDispatcher
+        BBSimEventDispatcher().flush_lifecycle_events()
         from bluuberrylibrary.events.event_dispatchers.zone.events.bb_on_zone_load_end_event import BBOnZoneLoadEndEvent
-        event = BBOnZoneLoadEndEvent(ModIdentity(), zone, household_id, is_build_mode, self.client_finished_first_load)
-        result = self.dispatch(event)
+        if self.has_event_handlers(BBOnZoneLoadEndEvent):
+            event = BBOnZoneLoadEndEvent(ModIdentity(), zone, household_id, is_build_mode, self.client_finished_first_load)
+            result = self.dispatch(event)
+        else:
+            result = BBRunResult.TRUE
         self._client_finished_first_load = True
         self._client_is_loading = False
         return result
@@ -65,6 +74,8 @@ class BBZoneEventDispatcher(BBEventDispatcher):
         self._client_is_loading = True
         from bluuberrylibrary.events.event_dispatchers.zone.events.bb_on_zone_load_start_event import \
             BBOnZoneLoadStartEvent
+        if not self.has_event_handlers(BBOnZoneLoadStartEvent):
+            return BBRunResult.TRUE
         event = BBOnZoneLoadStartEvent(ModIdentity(), zone, self.client_finished_first_load)
         result = self.dispatch(event)
         return result
@@ -82,8 +93,13 @@ class BBZoneEventDispatcher(BBEventDispatcher):
         :rtype: BBRunResult
         """
         self._client_is_loading = True
+        # Sims that spawned or despawned before the unload are dispatched while the zone still exists.
+        from bluuberrylibrary.events.event_dispatchers.sim.bb_sim_event_dispatcher import BBSimEventDispatcher
+        BBSimEventDispatcher().flush_lifecycle_events()
         from bluuberrylibrary.events.event_dispatchers.zone.events.bb_on_zone_unload_start_event import \
             BBOnZoneUnloadStartEvent
+        if not self.has_event_handlers(BBOnZoneUnloadStartEvent):
+            return BBRunResult.TRUE
         event = BBOnZoneUnloadStartEvent(ModIdentity(), zone, client)
         result = self.dispatch(event)
         return result
@@ -110,7 +126,22 @@ def _bbl_on_zone_finished_loading_to_build_mode(original, self: Zone, household_
     return result
 
 
+@BBInjectionUtils.inject(ModIdentity(), Zone, Zone.update.__name__, log_errors=False)
+def _bbl_on_zone_update(original, self: Zone, *args, **kwargs):
+    result = original(self, *args, **kwargs)
+    BBEventHandlerRegistry().process_deferred_events()
+    BBEventHandlerRegistry().run_scheduled_handlers()
+    return result
+
+
 @BBInjectionUtils.inject(ModIdentity(), Zone, Zone.on_teardown.__name__, log_errors=False)
 def _bbl_on_zone_unload(original, self: Zone, client: Client):
+    BBEventHandlerRegistry().process_deferred_events()
     BBZoneEventDispatcher().on_zone_unload_started(self, client)
+    # Deliver what was queued while the unload was dispatched, such as the unload event itself and the events its handlers flushed, while the zone still exists.
+    BBEventHandlerRegistry().process_deferred_events()
+    # Handlers that yielded do not continue into the next zone, with Sims and objects that no longer exist.
+    BBEventHandlerRegistry().finish_scheduled_handlers()
+    BBErrorAggregator().write_summary()
+    BBLogWriter().flush()
     return original(self, client)
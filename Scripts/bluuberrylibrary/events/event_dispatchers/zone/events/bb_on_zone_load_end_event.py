@@ -41,6 +41,8 @@ class BBOnZoneLoadEndEvent(BBEvent):
     :param is_first_load: True, indicates this is the first time the client has loaded into a zone. False, if the client has previously loaded into a zone.
     :type is_first_load: bool
     """
+    __slots__ = ('_zone', '_household_id', '_is_build_mode', '_is_first_load')
+
     def __init__(self, mod_identity: BBModIdentity, zone: Zone, household_id: int, is_build_mode: bool, is_first_load: bool):
         super().__init__(mod_identity)
         self._zone = zone
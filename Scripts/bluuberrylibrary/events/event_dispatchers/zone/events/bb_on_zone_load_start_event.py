@@ -37,6 +37,8 @@ class BBOnZoneLoadStartEvent(BBEvent):
     :param is_first_load: True, indicates this is the first time the client has loaded into a zone. False, if the client has previously loaded into a zone.
     :type is_first_load: bool
     """
+    __slots__ = ('_zone', '_is_first_load')
+
     def __init__(self, mod_identity: BBModIdentity, zone: Zone, is_first_load: bool):
         super().__init__(mod_identity)
         self._zone = zone
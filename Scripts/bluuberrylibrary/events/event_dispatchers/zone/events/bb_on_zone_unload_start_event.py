@@ -38,6 +38,8 @@ class BBOnZoneUnloadStartEvent(BBEvent):
     :param client: The client performing the action.
     :type client: Client
     """
+    __slots__ = ('_zone', '_client')
+
     def __init__(self, mod_identity: BBModIdentity, zone: Zone, client: Client):
         super().__init__(mod_identity)
         self._zone = zone
@@ -10,10 +10,36 @@ from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
 
 class BBEvent:
     """An event dispatched by event handlers. It will be used to notify any functions listening for it."""
+    __slots__ = ('_mod_identity', '_is_propagation_stopped')
+
     def __init__(self, mod_identity: BBModIdentity):
         self._mod_identity = mod_identity
+        self._is_propagation_stopped = False
 
     @property
     def mod_identity(self) -> BBModIdentity:
         """The identity of the mod dispatching this event."""
         return self._mod_identity
+
+    @property
+    def is_propagation_stopped(self) -> bool:
+        """True, if a handler has stopped this event from reaching any further handlers. False, if not."""
+        return self._is_propagation_stopped
+
+    def stop_propagation(self) -> None:
+        """stop_propagation()
+
+        Prevent this event from being dispatched to any handlers that have not yet received it.
+
+        .. note:: Handlers receive events in order of their priority, the highest priority first.
+        """
+        self._is_propagation_stopped = True
+
+    def resolve_lazy_fields(self) -> None:
+        """resolve_lazy_fields()
+
+        Look up the fields of this event that are otherwise looked up the first time they are accessed.
+
+        .. note:: This is done automatically before the event is queued for a handler with a delivery mode of DEFERRED, since what those fields are looked up from may no longer exist once the event is delivered.
+        """
+        pass
@@ -0,0 +1,82 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+from bluuberrylibrary.mod_identity import ModIdentity
+from sims4.commands import Command, CommandType
+
+
+@Command(
+    'bbl.enable_event_stats',
+    # 'Start measuring the time spent by event handlers. View the results with bbl.event_stats',
+    command_type=CommandType.Live
+)
+def _bbl_command_enable_event_stats(_connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+    if BBEventHandlerRegistry().is_profiling:
+        output('Event stats are already enabled.')
+        return
+    BBEventHandlerRegistry().enable_profiling()
+    output('Event stats are now enabled.')
+
+
+@Command(
+    'bbl.disable_event_stats',
+    # 'Stop measuring the time spent by event handlers. Stats already collected are kept.',
+    command_type=CommandType.Live
+)
+def _bbl_command_disable_event_stats(_connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+    if not BBEventHandlerRegistry().is_profiling:
+        output('Event stats are already disabled.')
+        return
+    BBEventHandlerRegistry().disable_profiling()
+    output('Event stats are now disabled.')
+
+
+@Command(
+    'bbl.event_stats',
+    # 'Write the time spent by each event handler to "The Sims 4/bb_logs/BluuberryLibrary_version_Debug.txt"',
+    command_type=CommandType.Live
+)
+def _bbl_command_event_stats(reset: bool = False, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+    profiler = BBEventHandlerRegistry().profiler
+    if profiler is None:
+        output('No event stats have been collected. Enable them with bbl.enable_event_stats')
+        return
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    log = BBLogRegistry().register_log(ModIdentity(), 'bb_event_stats')
+    log.debug(f'Event Handler Stats:\n{profiler.format_statistics()}', ignore_enabled=True)
+    output(f'SUCCESS: Wrote the stats of {len(profiler.get_all_statistics())} event handler(s) to the bb_logs folder.')
+    if reset:
+        profiler.reset()
+        output('Event stats were reset.')
+
+
+@Command(
+    'bbl.resume_event_handlers',
+    # 'Resume all event handlers suspended because they failed too often.',
+    command_type=CommandType.Live
+)
+def _bbl_command_resume_event_handlers(_connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+    suspended_event_handlers = BBEventHandlerRegistry().get_suspended_handlers()
+    if not suspended_event_handlers:
+        output('No event handlers are suspended.')
+        return
+    for event_handler in suspended_event_handlers:
+        output(f'Resuming {event_handler.mod_identity.mod_name} {event_handler.handler_name}')
+        BBEventHandlerRegistry().resume_handler(event_handler)
+    output(f'SUCCESS: Resumed {len(suspended_event_handlers)} event handler(s).')
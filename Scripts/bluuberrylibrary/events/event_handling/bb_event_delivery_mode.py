@@ -0,0 +1,18 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+from bluuberrylibrary.enums.classes.bb_int import BBInt
+
+
+class BBEventDeliveryMode(BBInt):
+    """Ways in which events are delivered to event handlers.
+
+    - IMMEDIATE: The handler receives each event as soon as it is dispatched.
+    - DEFERRED: Events are queued and the handler receives them as a list at the end of the next Zone update.
+    """
+    IMMEDIATE: 'BBEventDeliveryMode' = ...
+    DEFERRED: 'BBEventDeliveryMode' = ...
@@ -0,0 +1,107 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+from operator import attrgetter
+from typing import Any, Iterable, FrozenSet, Union
+
+from bluuberrylibrary.events.event_handling.bb_event import BBEvent
+from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
+
+
+class BBEventFilter:
+    """BBEventFilter(attribute_path, values)
+
+    A filter checked by the :class:`.BBEventHandlerRegistry` before an event is given to a handler.
+    An event passes the filter when the value at `attribute_path` on the event is one of `values`.
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        # Only receive the event when one of the two interactions completes.
+        @BBEventHandlerRegistry.register(ModIdentity(), BBOnInteractionCompletedEvent, filters=(BBEventFilter.interaction_guids((12345, 67890)),))
+        def _bbl_handle_on_interaction_completed(event: BBOnInteractionCompletedEvent) -> BBRunResult:
+            return BBRunResult.TRUE
+
+    :param attribute_path: A dotted path of attributes on the event, for example 'interaction.guid64'.
+    :type attribute_path: str
+    :param values: The values allowed to pass the filter. They must be hashable.
+    :type values: Iterable[Any]
+    """
+    def __init__(self, attribute_path: str, values: Iterable[Any]):
+        self._attribute_path = attribute_path
+        self._get_value = attrgetter(attribute_path)
+        self._values: FrozenSet[Any] = frozenset(values)
+
+    @property
+    def attribute_path(self) -> str:
+        """The dotted path of attributes on the event being checked."""
+        return self._attribute_path
+
+    @property
+    def values(self) -> FrozenSet[Any]:
+        """The values allowed to pass the filter."""
+        return self._values
+
+    def matches(self, event: BBEvent) -> bool:
+        """matches(event)
+
+        Determine if an event passes the filter.
+
+        :param event: The event to check.
+        :type event: BBEvent
+        :return: True, if the event passes the filter. False, if not. Events missing the attribute do not pass.
+        :rtype: bool
+        """
+        try:
+            return self._get_value(event) in self._values
+        except (AttributeError, TypeError):
+            return False
+
+    @classmethod
+    def interaction_guids(cls, interaction_guids: Iterable[int]) -> 'BBEventFilter':
+        """interaction_guids(interaction_guids)
+
+        Create a filter that passes events for the specified interactions.
+
+        :param interaction_guids: The decimal identifiers of interactions.
+        :type interaction_guids: Iterable[int]
+        :return: A filter checking the `interaction` of an event.
+        :rtype: BBEventFilter
+        """
+        return cls('interaction.guid64', interaction_guids)
+
+    @classmethod
+    def sim_ids(cls, sim_ids: Iterable[int]) -> 'BBEventFilter':
+        """sim_ids(sim_ids)
+
+        Create a filter that passes events for the specified Sims.
+
+        :param sim_ids: The identifiers of Sims.
+        :type sim_ids: Iterable[int]
+        :return: A filter checking the `sim_info` of an event.
+        :rtype: BBEventFilter
+        """
+        return cls('sim_info.sim_id', sim_ids)
+
+    @classmethod
+    def mod_identities(cls, mod_identities: Iterable[Union[str, BBModIdentity]]) -> 'BBEventFilter':
+        """mod_identities(mod_identities)
+
+        Create a filter that passes events dispatched by the specified mods.
+
+        :param mod_identities: The identities or names of mods.
+        :type mod_identities: Iterable[Union[str, BBModIdentity]]
+        :return: A filter checking the `mod_identity` of an event.
+        :rtype: BBEventFilter
+        """
+        mod_names = [mod_identity if isinstance(mod_identity, str) else mod_identity.mod_name for mod_identity in mod_identities]
+        return cls('mod_identity.mod_name', mod_names)
+
+    def __repr__(self) -> str:
+        return '<BBEventFilter: {} in {}>'.format(self._attribute_path, sorted(self._values, key=str))
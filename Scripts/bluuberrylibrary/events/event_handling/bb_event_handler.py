@@ -5,15 +5,20 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
-from typing import Type, Callable
+import weakref
+from collections import deque
+from typing import Type, Callable, List, Deque, Union, Iterable, Tuple
 
 from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.events.event_handling.bb_event import BBEvent
+from bluuberrylibrary.events.event_handling.bb_event_delivery_mode import BBEventDeliveryMode
+from bluuberrylibrary.events.event_handling.bb_event_filter import BBEventFilter
+from bluuberrylibrary.events.event_handling.bb_event_handler_circuit_breaker import BBEventHandlerCircuitBreaker
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
 
 
 class BBEventHandler:
-    """BBEventHandler(mod_identity, event_type, handler)
+    """BBEventHandler(mod_identity, event_type, handler, delivery_mode=BBEventDeliveryMode.IMMEDIATE, max_pending_events=1000, priority=0, filters=(), once=False, weak=False, handle_id=0, circuit_breaker=None)
 
     Handles events when they occur.
 
@@ -22,7 +27,23 @@ class BBEventHandler:
     :param event_type: The type of event being handled.
     :type event_type: Type[BBEvent]
     :param handler: The function that handles events.
-    :type handler: Callable[[BBEvent], BBRunResult]
+    :type handler: Union[Callable[[BBEvent], BBRunResult], Callable[[List[BBEvent]], BBRunResult]]
+    :param delivery_mode: How events are delivered to the handler. When DEFERRED, the handler receives a list of events instead of a single event. Default is IMMEDIATE.
+    :type delivery_mode: BBEventDeliveryMode, optional
+    :param max_pending_events: The maximum number of events kept while waiting for deferred delivery. When full, the oldest events are dropped. Default is 1000.
+    :type max_pending_events: int, optional
+    :param priority: Handlers with a higher priority receive events before handlers with a lower priority. Default is 0.
+    :type priority: int, optional
+    :param filters: Filters an event must pass before it is given to the handler. Default is no filters.
+    :type filters: Iterable[BBEventFilter], optional
+    :param once: If True, the handler is unregistered after it handles an event successfully. Default is False.
+    :type once: bool, optional
+    :param weak: If True, only a weak reference to the handling function is kept and the handler is unregistered once the function (or the object it is bound to) is garbage collected. Default is False.
+    :type weak: bool, optional
+    :param handle_id: A token identifying the handler within the registry. Default is 0.
+    :type handle_id: int, optional
+    :param circuit_breaker: Suspends the handler when it keeps failing. If None, a circuit breaker with default settings is used. Default is None.
+    :type circuit_breaker: BBEventHandlerCircuitBreaker, optional
     :exception RuntimeError: When event_function is None.
     :exception TypeError: When event_function is not a callable function.
     :exception AssertionError: When the event_function is missing the event_data argument, when the event_function contains a self or cls argument, or when more than one argument is found.
@@ -31,11 +52,44 @@ class BBEventHandler:
         self,
         mod_identity: BBModIdentity,
         event_type: Type[BBEvent],
-        handler: Callable[[BBEvent], BBRunResult]
+        handler: Union[Callable[[BBEvent], BBRunResult], Callable[[List[BBEvent]], BBRunResult]],
+        delivery_mode: BBEventDeliveryMode = BBEventDeliveryMode.IMMEDIATE,
+        max_pending_events: int = 1000,
+        priority: int = 0,
+        filters: Iterable[BBEventFilter] = (),
+        once: bool = False,
+        weak: bool = False,
+        handle_id: int = 0,
+        circuit_breaker: BBEventHandlerCircuitBreaker = None
     ):
         self._mod_identity = mod_identity
         self._event_type = event_type
-        self._handler = handler
+        self._handler_name: str = getattr(handler, '__qualname__', None) or repr(handler)
+        if weak:
+            self._handler = None
+            self._handler_reference = self._create_weak_reference(handler, handle_id)
+        else:
+            self._handler = handler
+            self._handler_reference = None
+        self._delivery_mode = delivery_mode
+        self._pending_events: Deque[BBEvent] = deque(maxlen=max_pending_events)
+        self._dropped_event_count = 0
+        self._priority = priority
+        self._filters: Tuple[BBEventFilter, ...] = tuple(filters)
+        self._once = once
+        self._handle_id = handle_id
+        self._is_registered = True
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else BBEventHandlerCircuitBreaker()
+
+    @staticmethod
+    def _create_weak_reference(handler: Callable[..., BBRunResult], handle_id: int) -> weakref.ref:
+        def _on_handler_collected(_) -> None:
+            from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+            BBEventHandlerRegistry().unregister_handler(handle_id)
+
+        if hasattr(handler, '__self__') and hasattr(handler, '__func__'):
+            return weakref.WeakMethod(handler, _on_handler_collected)
+        return weakref.ref(handler, _on_handler_collected)
 
     @property
     def mod_identity(self) -> BBModIdentity:
@@ -47,14 +101,100 @@ class BBEventHandler:
         return self._mod_identity
 
     @property
-    def handler(self) -> Callable[[BBEvent], BBRunResult]:
+    def handler(self) -> Union[Callable[[BBEvent], BBRunResult], Callable[[List[BBEvent]], BBRunResult], None]:
         """The function invoked when the handler handles an event.
 
-        :return: A function invoked upon handling events.
-        :rtype: Callable[[BBEvent], BBRunResult]
+        :return: A function invoked upon handling events or None if the handler was weakly referenced and has been garbage collected.
+        :rtype: Union[Callable[[BBEvent], BBRunResult], Callable[[List[BBEvent]], BBRunResult], None]
         """
+        if self._handler_reference is not None:
+            return self._handler_reference()
         return self._handler
 
+    @property
+    def handler_name(self) -> str:
+        """The qualified name of the function invoked when the handler handles an event.
+
+        :return: The name of the handling function.
+        :rtype: str
+        """
+        return self._handler_name
+
+    @property
+    def handle_id(self) -> int:
+        """A token identifying the handler within the registry. It can be used to unregister the handler.
+
+        :return: The identifier of the handler.
+        :rtype: int
+        """
+        return self._handle_id
+
+    @property
+    def once(self) -> bool:
+        """True, if the handler is unregistered after it handles an event successfully. False, if not."""
+        return self._once
+
+    @property
+    def is_registered(self) -> bool:
+        """True, if the handler is still registered to receive events. False, if not."""
+        return self._is_registered
+
+    @property
+    def circuit_breaker(self) -> BBEventHandlerCircuitBreaker:
+        """Suspends the handler when it keeps failing.
+
+        :return: The circuit breaker of the handler.
+        :rtype: BBEventHandlerCircuitBreaker
+        """
+        return self._circuit_breaker
+
+    @property
+    def is_suspended(self) -> bool:
+        """True, if the handler failed too often and does not receive events until it is resumed. False, if not."""
+        return self._circuit_breaker.is_suspended
+
+    @property
+    def priority(self) -> int:
+        """Handlers with a higher priority receive events before handlers with a lower priority.
+
+        :return: The priority of the handler.
+        :rtype: int
+        """
+        return self._priority
+
+    @property
+    def filters(self) -> Tuple[BBEventFilter, ...]:
+        """Filters an event must pass before it is given to the handler.
+
+        :return: A collection of filters.
+        :rtype: Tuple[BBEventFilter, ...]
+        """
+        return self._filters
+
+    @property
+    def delivery_mode(self) -> BBEventDeliveryMode:
+        """How events are delivered to this handler.
+
+        :return: A delivery mode.
+        :rtype: BBEventDeliveryMode
+        """
+        return self._delivery_mode
+
+    @property
+    def is_deferred(self) -> bool:
+        """True, if this handler receives events in batches. False, if it receives them as they are dispatched."""
+        return self._delivery_mode == BBEventDeliveryMode.DEFERRED
+
+    @property
+    def has_pending_events(self) -> bool:
+        """True, if events are waiting to be delivered to this handler. False, if not."""
+        return len(self._pending_events) > 0
+
+    @property
+    def dropped_event_count(self) -> int:
+        """The number of events dropped because too many events were waiting for deferred delivery."""
+        return self._dropped_event_count
+
     @property
     def event_type(self) -> Type[BBEvent]:
         """The type of events this handler waits for.
@@ -65,7 +205,63 @@ class BBEventHandler:
         return self._event_type
 
     def can_handle(self, event: BBEvent) -> bool:
-        return isinstance(event, self.event_type)
+        return isinstance(event, self.event_type) and self.matches_filters(event)
+
+    def matches_filters(self, event: BBEvent) -> bool:
+        """matches_filters(event)
+
+        Determine if an event passes all filters of the handler.
+
+        :param event: The event to check.
+        :type event: BBEvent
+        :return: True, if the event passes all filters or the handler has no filters. False, if not.
+        :rtype: bool
+        """
+        for event_filter in self._filters:
+            if not event_filter.matches(event):
+                return False
+        return True
 
     def handle(self, event: BBEvent) -> BBRunResult:
-        return self._handler(event)
+        handler = self.handler
+        if handler is None:
+            return BBRunResult.TRUE
+        return handler(event)
+
+    def _on_unregistered(self) -> None:
+        self._is_registered = False
+        self._pending_events.clear()
+
+    def queue_event(self, event: BBEvent) -> None:
+        """queue_event(event)
+
+        Queue an event for deferred delivery.
+
+        :param event: The event to queue.
+        :type event: BBEvent
+        """
+        if len(self._pending_events) == self._pending_events.maxlen:
+            self._dropped_event_count += 1
+        self._pending_events.append(event)
+
+    def clear_pending_events(self) -> None:
+        """clear_pending_events()
+
+        Discard all events queued for deferred delivery.
+        """
+        self._pending_events.clear()
+
+    def handle_pending_events(self) -> BBRunResult:
+        """handle_pending_events()
+
+        Deliver all queued events to the handler as a single list.
+
+        :return: The result of handling the events.
+        :rtype: BBRunResult
+        """
+        pending_events = list(self._pending_events)
+        self._pending_events.clear()
+        handler = self.handler
+        if handler is None:
+            return BBRunResult.TRUE
+        return handler(pending_events)
@@ -0,0 +1,134 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Union
+
+
+class BBEventHandlerCircuitBreaker:
+    """BBEventHandlerCircuitBreaker(max_failures=5, window_seconds=60.0, backoff_seconds=None, clock=time.monotonic)
+
+    Suspends an event handler that keeps failing, so a broken handler does not log an error for every event it receives.
+
+    When a handler fails `max_failures` times within `window_seconds`, it is suspended and a single report with the number of failures is logged.
+    A suspended handler receives no events until it is resumed, either manually or automatically once `backoff_seconds` have passed.
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        # Suspend the handler after 3 failures within 10 seconds and try again after 5 minutes.
+        @BBEventHandlerRegistry.register(ModIdentity(), BBOnInteractionCompletedEvent, circuit_breaker=BBEventHandlerCircuitBreaker(max_failures=3, window_seconds=10.0, backoff_seconds=300.0))
+        def _bbl_handle_on_interaction_completed(event: BBOnInteractionCompletedEvent) -> BBRunResult:
+            return BBRunResult.TRUE
+
+    :param max_failures: The number of failures within the window that suspend the handler. Default is 5.
+    :type max_failures: int, optional
+    :param window_seconds: The number of seconds failures are counted within. Default is 60.0.
+    :type window_seconds: float, optional
+    :param backoff_seconds: The number of seconds after which a suspended handler is resumed. If None, the handler stays suspended until resumed manually. Default is None.
+    :type backoff_seconds: float, optional
+    :param clock: A function returning the current time in seconds. Default is time.monotonic.
+    :type clock: Callable[[], float], optional
+    """
+    def __init__(self, max_failures: int = 5, window_seconds: float = 60.0, backoff_seconds: Union[float, None] = None, clock: Callable[[], float] = time.monotonic):
+        self._max_failures = max_failures
+        self._window_seconds = window_seconds
+        self._backoff_seconds = backoff_seconds
+        self._clock = clock
+        self._failure_times: Deque[float] = deque(maxlen=max_failures)
+        # The failures since the handler was last resumed, by exception type name.
+        self._failure_counts: Counter = Counter()
+        self._total_failure_count = 0
+        self._suspended_at: Union[float, None] = None
+        self._suspension_count = 0
+
+    @property
+    def max_failures(self) -> int:
+        """The number of failures within the window that suspend the handler."""
+        return self._max_failures
+
+    @property
+    def window_seconds(self) -> float:
+        """The number of seconds failures are counted within."""
+        return self._window_seconds
+
+    @property
+    def backoff_seconds(self) -> Union[float, None]:
+        """The number of seconds after which a suspended handler is resumed or None if it is never resumed automatically."""
+        return self._backoff_seconds
+
+    @property
+    def total_failure_count(self) -> int:
+        """The number of failures recorded since the circuit breaker was created."""
+        return self._total_failure_count
+
+    @property
+    def suspension_count(self) -> int:
+        """The number of times the handler was suspended."""
+        return self._suspension_count
+
+    @property
+    def is_suspended(self) -> bool:
+        """True, if the handler is suspended and should not receive events. False, if not.
+
+        .. note:: A handler whose backoff has passed is resumed when this is checked.
+        """
+        if self._suspended_at is None:
+            return False
+        if self._backoff_seconds is not None and self._clock() - self._suspended_at >= self._backoff_seconds:
+            self.resume()
+            return False
+        return True
+
+    def record_failure(self, exception: Exception) -> bool:
+        """record_failure(exception)
+
+        Record a failure of the handler.
+
+        :param exception: The exception raised by the handler.
+        :type exception: Exception
+        :return: True, if the failure suspended the handler. False, if not.
+        :rtype: bool
+        """
+        now = self._clock()
+        self._total_failure_count += 1
+        self._failure_counts[type(exception).__name__] += 1
+        self._failure_times.append(now)
+        if self._max_failures <= 0 or self._suspended_at is not None:
+            return False
+        if len(self._failure_times) < self._max_failures or now - self._failure_times[0] > self._window_seconds:
+            return False
+        self._suspended_at = now
+        self._suspension_count += 1
+        return True
+
+    def resume(self) -> None:
+        """resume()
+
+        Resume a suspended handler and forget its recent failures.
+        """
+        self._suspended_at = None
+        self._failure_times.clear()
+        self._failure_counts.clear()
+
+    def format_report(self) -> str:
+        """format_report()
+
+        Format a summary of the failures that led to the handler being suspended.
+
+        :return: A summary of failures.
+        :rtype: str
+        """
+        exception_counts = ', '.join('{} x{}'.format(exception_name, exception_count) for (exception_name, exception_count) in self._failure_counts.most_common())
+        if self._backoff_seconds is None:
+            resume_text = 'It will stay suspended until resumed manually.'
+        else:
+            resume_text = 'It will be resumed in {:g} seconds.'.format(self._backoff_seconds)
+        return '{} failures within {:g} seconds. Failures since last resumed: {}. {}'.format(self._max_failures, self._window_seconds, exception_counts, resume_text)
@@ -0,0 +1,188 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from bluuberrylibrary.events.event_handling.bb_event_handler import BBEventHandler
+
+
+class BBEventHandlerStatistics:
+    """BBEventHandlerStatistics(mod_name, handler_name, max_samples=1000)
+
+    Timing information gathered for a single event handler.
+
+    :param mod_name: The name of the mod that owns the handler.
+    :type mod_name: str
+    :param handler_name: The qualified name of the handling function.
+    :type handler_name: str
+    :param max_samples: The number of most recent call times kept for calculating percentiles. Default is 1000.
+    :type max_samples: int, optional
+    """
+    def __init__(self, mod_name: str, handler_name: str, max_samples: int = 1000):
+        self._mod_name = mod_name
+        self._handler_name = handler_name
+        self._call_count = 0
+        self._exception_count = 0
+        self._total_time = 0.0
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    @property
+    def mod_name(self) -> str:
+        """The name of the mod that owns the handler."""
+        return self._mod_name
+
+    @property
+    def handler_name(self) -> str:
+        """The qualified name of the handling function."""
+        return self._handler_name
+
+    @property
+    def call_count(self) -> int:
+        """The number of times the handler was invoked."""
+        return self._call_count
+
+    @property
+    def exception_count(self) -> int:
+        """The number of times the handler raised an exception."""
+        return self._exception_count
+
+    @property
+    def total_time(self) -> float:
+        """The total time spent inside the handler, in seconds."""
+        return self._total_time
+
+    @property
+    def mean_time(self) -> float:
+        """The average time spent inside the handler per call, in seconds."""
+        if not self._call_count:
+            return 0.0
+        return self._total_time / self._call_count
+
+    @property
+    def p99_time(self) -> float:
+        """The time under which 99 percent of the most recent calls completed, in seconds."""
+        if not self._samples:
+            return 0.0
+        sorted_samples = sorted(self._samples)
+        return sorted_samples[max(0, math.ceil(len(sorted_samples) * 0.99) - 1)]
+
+    def record(self, elapsed_time: float, raised_exception: bool = False) -> None:
+        """record(elapsed_time, raised_exception=False)
+
+        Record a single call of the handler.
+
+        :param elapsed_time: The time the call took, in seconds.
+        :type elapsed_time: float
+        :param raised_exception: True, if the call raised an exception. Default is False.
+        :type raised_exception: bool, optional
+        """
+        self._call_count += 1
+        self._total_time += elapsed_time
+        self._samples.append(elapsed_time)
+        if raised_exception:
+            self._exception_count += 1
+
+
+class BBEventHandlerProfiler:
+    """BBEventHandlerProfiler(clock=time.perf_counter)
+
+    Measures the time spent by event handlers while handling events.
+
+    .. note:: Enable it via :func:`~BBEventHandlerRegistry.enable_profiling` or the `bbl.enable_event_stats` command.
+
+    :param clock: A function returning the current time in seconds. Default is time.perf_counter.
+    :type clock: Callable[[], float], optional
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._statistics: Dict[Tuple[str, str], BBEventHandlerStatistics] = dict()
+
+    def get_statistics(self, event_handler: BBEventHandler) -> BBEventHandlerStatistics:
+        """get_statistics(event_handler)
+
+        Retrieve the statistics recorded for an event handler.
+
+        :param event_handler: The event handler.
+        :type event_handler: BBEventHandler
+        :return: The statistics of the handler.
+        :rtype: BBEventHandlerStatistics
+        """
+        mod_name = event_handler.mod_identity.mod_name
+        handler_name = event_handler.handler_name
+        key = (mod_name, handler_name)
+        statistics = self._statistics.get(key, None)
+        if statistics is None:
+            statistics = BBEventHandlerStatistics(mod_name, handler_name)
+            self._statistics[key] = statistics
+        return statistics
+
+    def get_all_statistics(self) -> List[BBEventHandlerStatistics]:
+        """get_all_statistics()
+
+        Retrieve the statistics of all handlers, the handlers that took the most time first.
+
+        :return: A list of statistics.
+        :rtype: List[BBEventHandlerStatistics]
+        """
+        return sorted(self._statistics.values(), key=lambda statistics: statistics.total_time, reverse=True)
+
+    def measure(self, event_handler: BBEventHandler, handle_function: Callable[..., Any], *args) -> Any:
+        """measure(event_handler, handle_function, *args)
+
+        Invoke a function on behalf of an event handler and record how long it took.
+
+        :param event_handler: The event handler being measured.
+        :type event_handler: BBEventHandler
+        :param handle_function: The function to invoke.
+        :type handle_function: Callable[..., Any]
+        :return: The result of the function.
+        :rtype: Any
+        """
+        start_time = self._clock()
+        try:
+            result = handle_function(*args)
+        except StopIteration:
+            # The last step of a handler that yielded, it finished normally.
+            self.get_statistics(event_handler).record(self._clock() - start_time)
+            raise
+        except Exception:
+            self.get_statistics(event_handler).record(self._clock() - start_time, raised_exception=True)
+            raise
+        self.get_statistics(event_handler).record(self._clock() - start_time)
+        return result
+
+    def reset(self) -> None:
+        """reset()
+
+        Discard all recorded statistics.
+        """
+        self._statistics.clear()
+
+    def format_statistics(self) -> str:
+        """format_statistics()
+
+        Format the recorded statistics as a table, the handlers that took the most time first.
+
+        :return: A table of statistics.
+        :rtype: str
+        """
+        rows = [('Mod', 'Handler', 'Calls', 'Total (ms)', 'Mean (ms)', 'P99 (ms)', 'Exceptions')]
+        for statistics in self.get_all_statistics():
+            rows.append((
+                statistics.mod_name,
+                statistics.handler_name,
+                str(statistics.call_count),
+                '{:.3f}'.format(statistics.total_time * 1000),
+                '{:.3f}'.format(statistics.mean_time * 1000),
+                '{:.3f}'.format(statistics.p99_time * 1000),
+                str(statistics.exception_count)
+            ))
+        column_widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]))]
+        return '\n'.join(' | '.join(value.ljust(column_widths[index]) for (index, value) in enumerate(row)) for row in rows)
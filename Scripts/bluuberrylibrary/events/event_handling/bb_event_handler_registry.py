@@ -1,8 +1,16 @@
-from typing import Any, Type, List, Callable
+from bisect import bisect_right
+from itertools import count
+from types import GeneratorType
+from typing import Any, Type, List, Callable, Dict, Tuple, Union, Iterable
 
 from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.events.event_handling.bb_event import BBEvent
+from bluuberrylibrary.events.event_handling.bb_event_delivery_mode import BBEventDeliveryMode
+from bluuberrylibrary.events.event_handling.bb_event_filter import BBEventFilter
 from bluuberrylibrary.events.event_handling.bb_event_handler import BBEventHandler
+from bluuberrylibrary.events.event_handling.bb_event_handler_circuit_breaker import BBEventHandlerCircuitBreaker
+from bluuberrylibrary.events.event_handling.bb_event_handler_profiler import BBEventHandlerProfiler
+from bluuberrylibrary.events.event_handling.bb_event_handler_scheduler import BBEventHandlerScheduler
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
 from bluuberrylibrary.classes.bb_singleton import BBSingleton
 
@@ -26,9 +34,148 @@ class BBEventHandlerRegistry(metaclass=BBSingleton):
         @BBEventHandlerRegistry().register(ModIdentity(), BBEvent())
         def _bbl_handle_on_zone_load_event(event: BBEvent):
 
+    Handlers registered with a delivery mode of DEFERRED receive every event dispatched since the end of the previous Zone update as a single list.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        @BBEventHandlerRegistry().register(ModIdentity(), BBOnInteractionCompletedEvent, delivery_mode=BBEventDeliveryMode.DEFERRED)
+        def _bbl_handle_on_interactions_completed(events: List[BBOnInteractionCompletedEvent]):
+
+    Handlers with a higher priority receive events first and may call `event.stop_propagation()` to keep the event from reaching the handlers after them.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        @BBEventHandlerRegistry().register(ModIdentity(), BBOnInteractionCompletedEvent, priority=100)
+        def _bbl_handle_on_interaction_completed(event: BBOnInteractionCompletedEvent):
+            if event.interaction.guid64 not in _WATCHED_INTERACTION_IDS:
+                event.stop_propagation()
+
+    Handlers may be registered to receive a single event, or to be weakly referenced so they are unregistered automatically once the object owning them is garbage collected.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        event_handler = BBEventHandlerRegistry().register_handler(ModIdentity(), BBOnZoneUnloadStartEvent, self._on_zone_unload, once=True, weak=True)
+        # Handlers may be unregistered early using their handle id.
+        BBEventHandlerRegistry().unregister_handler(event_handler.handle_id)
+
+    Handlers that keep failing are suspended by their circuit breaker, so they stop receiving events and stop filling the logs with the same error.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        for event_handler in BBEventHandlerRegistry().get_suspended_handlers():
+            BBEventHandlerRegistry().resume_handler(event_handler)
+
+    Handlers may yield to spread expensive work across Zone updates. What remains is continued at the end of the following Zone updates, within the time budget of the mod.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        @BBEventHandlerRegistry().register(ModIdentity(), BBOnZoneLoadEndEvent)
+        def _bbl_handle_on_zone_load_end(event: BBOnZoneLoadEndEvent):
+            for sim_info in BBSimUtils.get_all_sim_info_gen():
+                _do_expensive_work(sim_info)
+                yield
+
     """
     def __init__(self):
+        # Kept sorted by priority, the highest first, then by the order they were registered.
         self._event_handlers: List[BBEventHandler] = []
+        self._event_handler_sort_keys: List[Tuple[int, int]] = []
+        self._registration_counter = count(1)
+        self._event_handlers_by_handle_id: Dict[int, BBEventHandler] = dict()
+        # Unregistered handlers are only marked as such and are removed from the sorted list the next time it is read.
+        self._has_unregistered_event_handlers = False
+        # Handlers interested in each concrete event type, resolved on first dispatch of that type.
+        self._event_handlers_by_event_type: Dict[Type[BBEvent], Tuple[BBEventHandler, ...]] = dict()
+        # Handlers waiting for deferred delivery by handle id, in the order their first pending event was queued.
+        self._event_handlers_with_pending_events: Dict[int, BBEventHandler] = dict()
+        # The profiler is kept after profiling is disabled so its statistics can still be viewed.
+        self._profiler: Union[BBEventHandlerProfiler, None] = None
+        self._active_profiler: Union[BBEventHandlerProfiler, None] = None
+        self._scheduler = BBEventHandlerScheduler()
+
+    @property
+    def scheduler(self) -> BBEventHandlerScheduler:
+        """The scheduler continuing handlers that yield."""
+        return self._scheduler
+
+    @property
+    def profiler(self) -> Union[BBEventHandlerProfiler, None]:
+        """The profiler that measured event handlers most recently or None if profiling was never enabled."""
+        return self._profiler
+
+    @property
+    def is_profiling(self) -> bool:
+        """True, if the time spent by event handlers is being measured. False, if not."""
+        return self._active_profiler is not None
+
+    def enable_profiling(self, profiler: BBEventHandlerProfiler = None) -> BBEventHandlerProfiler:
+        """enable_profiling(profiler=None)
+
+        Start measuring the time spent by each event handler.
+
+        :param profiler: The profiler to record measurements with. If not specified, the current profiler is kept or a new one is created. Default is None.
+        :type profiler: BBEventHandlerProfiler, optional
+        :return: The profiler recording measurements.
+        :rtype: BBEventHandlerProfiler
+        """
+        if profiler is not None:
+            self._profiler = profiler
+        elif self._profiler is None:
+            self._profiler = BBEventHandlerProfiler()
+        self._active_profiler = self._profiler
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        """disable_profiling()
+
+        Stop measuring the time spent by event handlers.
+        """
+        self._active_profiler = None
+
+    def get_event_handlers(self, event_type: Type[BBEvent]) -> Tuple[BBEventHandler, ...]:
+        """get_event_handlers(event_type)
+
+        Retrieve the handlers that will receive events of a type.
+
+        .. note:: A handler receives an event when the event is an instance of the type the handler was registered for. The result is cached per event type until a handler is registered or unregistered.
+
+        :param event_type: The type of event.
+        :type event_type: Type[BBEvent]
+        :return: The handlers listening for events of the specified type, in the order they will receive them.
+        :rtype: Tuple[BBEventHandler, ...]
+        """
+        event_handlers = self._event_handlers_by_event_type.get(event_type, None)
+        if event_handlers is None:
+            if self._has_unregistered_event_handlers:
+                self._remove_unregistered_event_handlers()
+            event_handlers = tuple(event_handler for event_handler in self._event_handlers if issubclass(event_type, event_handler.event_type))
+            self._event_handlers_by_event_type[event_type] = event_handlers
+        return event_handlers
+
+    def has_event_handlers(self, event_type: Type[BBEvent]) -> bool:
+        """has_event_handlers(event_type)
+
+        Determine if any handlers will receive events of a type.
+
+        .. note:: Dispatchers use this to avoid creating events nobody is listening for.
+
+        :param event_type: The type of event.
+        :type event_type: Type[BBEvent]
+        :return: True, if at least one handler is listening for events of the specified type. False, if not.
+        :rtype: bool
+        """
+        return len(self.get_event_handlers(event_type)) > 0
+
+    def _remove_unregistered_event_handlers(self) -> None:
+        remaining_indexes = [index for (index, event_handler) in enumerate(self._event_handlers) if event_handler.is_registered]
+        self._event_handlers = [self._event_handlers[index] for index in remaining_indexes]
+        self._event_handler_sort_keys = [self._event_handler_sort_keys[index] for index in remaining_indexes]
+        self._has_unregistered_event_handlers = False
 
     def dispatch(self, event: BBEvent) -> BBRunResult:
         """dispatch(event)
@@ -41,21 +188,149 @@ class BBEventHandlerRegistry(metaclass=BBSingleton):
         :rtype: BBRunResult
         """
         all_success = BBRunResult.TRUE
-        for event_handler in self._event_handlers:
-            if event_handler.can_handle(event):
-                try:
+        profiler = self._active_profiler
+        for event_handler in self.get_event_handlers(type(event)):
+            if not event_handler.is_registered or event_handler.is_suspended:
+                continue
+            if event_handler.filters and not event_handler.matches_filters(event):
+                continue
+            if event_handler.is_deferred:
+                if event_handler.handle_id not in self._event_handlers_with_pending_events:
+                    self._event_handlers_with_pending_events[event_handler.handle_id] = event_handler
+                event.resolve_lazy_fields()
+                event_handler.queue_event(event)
+                continue
+            try:
+                if profiler is None:
                     result = event_handler.handle(event)
-                    if not result:
-                        all_success = result
-                except Exception as ex:
-                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                    _log = BBLogRegistry().register_log(event_handler.mod_identity, 'bb_event_dispatcher')
-                    _log.error(f'An error occurred in {event_handler.handler.__name__} while handling event {event}.', exception=ex, event=event, event_handler=event_handler, handling_function=event_handler.handler)
+                else:
+                    result = profiler.measure(event_handler, event_handler.handle, event)
+                is_scheduled = isinstance(result, GeneratorType)
+                if is_scheduled:
+                    self._scheduler.schedule(event_handler, result)
+                    result = BBRunResult.TRUE
+                if not result:
+                    all_success = result
+                elif event_handler.once:
+                    # A handler that yielded finishes handling the event it started on.
+                    self._unregister_handler(event_handler.handle_id, cancel_scheduled=not is_scheduled)
+            except Exception as ex:
+                self._on_handler_error(event_handler, event, ex)
+            if event.is_propagation_stopped:
+                break
+        return all_success
+
+    def process_deferred_events(self) -> BBRunResult:
+        """process_deferred_events()
+
+        Deliver all queued events to the handlers registered with a delivery mode of DEFERRED.
+
+        .. note:: This is done automatically at the end of each Zone update, and both before and after the Zone unload event is dispatched.
+
+        :return: The result of delivering the events.
+        :rtype: BBRunResult
+        """
+        if not self._event_handlers_with_pending_events:
+            return BBRunResult.TRUE
+        event_handlers = self._event_handlers_with_pending_events
+        self._event_handlers_with_pending_events = dict()
+        all_success = BBRunResult.TRUE
+        profiler = self._active_profiler
+        for event_handler in event_handlers.values():
+            if not event_handler.is_registered:
+                continue
+            if event_handler.is_suspended:
+                # A suspended handler does not receive events, including those queued before it was suspended.
+                event_handler.clear_pending_events()
+                continue
+            try:
+                if profiler is None:
+                    result = event_handler.handle_pending_events()
+                else:
+                    result = profiler.measure(event_handler, event_handler.handle_pending_events)
+                is_scheduled = isinstance(result, GeneratorType)
+                if is_scheduled:
+                    self._scheduler.schedule(event_handler, result)
+                    result = BBRunResult.TRUE
+                if not result:
+                    all_success = result
+                elif event_handler.once:
+                    self._unregister_handler(event_handler.handle_id, cancel_scheduled=not is_scheduled)
+            except Exception as ex:
+                self._on_handler_error(event_handler, None, ex)
         return all_success
 
+    def run_scheduled_handlers(self) -> None:
+        """run_scheduled_handlers()
+
+        Continue handlers that yielded while handling events, until each mod has used up its time budget.
+
+        .. note:: This is done automatically at the end of each Zone update, after deferred events are delivered.
+        """
+        self._scheduler.run(profiler=self._active_profiler)
+
+    def finish_scheduled_handlers(self) -> None:
+        """finish_scheduled_handlers()
+
+        Continue handlers that yielded while handling events until they are done, without a time budget.
+
+        .. note:: This is done automatically when a Zone unloads, after deferred events are delivered.
+        """
+        self._scheduler.finish(profiler=self._active_profiler)
+
+    def get_suspended_handlers(self) -> Tuple[BBEventHandler, ...]:
+        """get_suspended_handlers()
+
+        Retrieve the handlers suspended because they failed too often.
+
+        :return: The suspended handlers.
+        :rtype: Tuple[BBEventHandler, ...]
+        """
+        return tuple(event_handler for event_handler in self._event_handlers_by_handle_id.values() if event_handler.is_suspended)
+
+    def resume_handler(self, event_handler: Union[BBEventHandler, int]) -> None:
+        """resume_handler(event_handler)
+
+        Resume a handler suspended because it failed too often.
+
+        :param event_handler: The event handler being resumed or its handle id.
+        :type event_handler: Union[BBEventHandler, int]
+        """
+        handle_id = event_handler if isinstance(event_handler, int) else event_handler.handle_id
+        event_handler = self._event_handlers_by_handle_id.get(handle_id, None)
+        if event_handler is None:
+            return
+        event_handler.circuit_breaker.resume()
+
+    # noinspection PyMethodMayBeStatic
+    def _on_handler_error(self, event_handler: BBEventHandler, event: Union[BBEvent, None], exception: Exception, action: str = None):
+        is_suspended = event_handler.circuit_breaker.record_failure(exception)
+        if event_handler.is_suspended and not is_suspended:
+            # The failure was already reported when the handler was suspended.
+            return
+        if is_suspended:
+            self._scheduler.cancel(event_handler)
+        from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+        _log = BBLogRegistry().register_log(event_handler.mod_identity, 'bb_event_dispatcher')
+        if action is None:
+            action = 'handling deferred events' if event is None else f'handling event {event}'
+        if is_suspended:
+            _log.error(f'An error occurred in {event_handler.handler_name} while {action}. It was suspended after {event_handler.circuit_breaker.format_report()}', exception=exception, event=event, event_handler=event_handler, handling_function=event_handler.handler)
+        else:
+            _log.error(f'An error occurred in {event_handler.handler_name} while {action}.', exception=exception, event=event, event_handler=event_handler, handling_function=event_handler.handler)
+
     @staticmethod
-    def register(mod_identity: BBModIdentity, event_type: Type[BBEvent]) -> Callable[[Callable[[BBEvent], TestResult]], Callable[[BBEvent], TestResult]]:
-        """register(mod_identity, event_type)
+    def register(
+        mod_identity: BBModIdentity,
+        event_type: Type[BBEvent],
+        delivery_mode: BBEventDeliveryMode = BBEventDeliveryMode.IMMEDIATE,
+        max_pending_events: int = 1000,
+        priority: int = 0,
+        filters: Iterable[BBEventFilter] = (),
+        once: bool = False,
+        circuit_breaker: BBEventHandlerCircuitBreaker = None
+    ) -> Callable[[Callable[[BBEvent], TestResult]], Callable[[BBEvent], TestResult]]:
+        """register(mod_identity, event_type, delivery_mode=BBEventDeliveryMode.IMMEDIATE, max_pending_events=1000, priority=0, filters=(), once=False, circuit_breaker=None)
 
         Register a function as a handler of events.
 
@@ -63,16 +338,40 @@ class BBEventHandlerRegistry(metaclass=BBSingleton):
         :type mod_identity: BBModIdentity
         :param event_type: The type of event being handled.
         :type event_type: Type[BBEvent]
+        :param delivery_mode: How events are delivered to the handler. When DEFERRED, the handler receives a list of events at the end of the Zone update. Default is IMMEDIATE.
+        :type delivery_mode: BBEventDeliveryMode, optional
+        :param max_pending_events: The maximum number of events kept while waiting for deferred delivery. When full, the oldest events are dropped. Default is 1000.
+        :type max_pending_events: int, optional
+        :param priority: Handlers with a higher priority receive events before handlers with a lower priority. Default is 0.
+        :type priority: int, optional
+        :param filters: Filters an event must pass before it is given to the handler. Default is no filters.
+        :type filters: Iterable[BBEventFilter], optional
+        :param once: If True, the handler is unregistered after it handles an event successfully. Default is False.
+        :type once: bool, optional
+        :param circuit_breaker: Suspends the handler when it keeps failing. If None, a circuit breaker with default settings is used. Default is None.
+        :type circuit_breaker: BBEventHandlerCircuitBreaker, optional
         :return: A function that will handle events.
         :rtype: Callable[[Callable[[BBEvent], TestResult]], Callable[[BBEvent], TestResult]]
         """
         def _wrapped(handler: Callable[[BBEvent], TestResult]) -> Callable[..., Any]:
-            BBEventHandlerRegistry().register_handler(mod_identity, event_type, handler)
+            BBEventHandlerRegistry().register_handler(mod_identity, event_type, handler, delivery_mode=delivery_mode, max_pending_events=max_pending_events, priority=priority, filters=filters, once=once, circuit_breaker=circuit_breaker)
             return handler
         return _wrapped
 
-    def register_handler(self, mod_identity: BBModIdentity, event_type: Type[BBEvent], handler: Callable[[BBEvent], TestResult]) -> BBEventHandler:
-        """register_handler(mod_identity, event_type, handler)
+    def register_handler(
+        self,
+        mod_identity: BBModIdentity,
+        event_type: Type[BBEvent],
+        handler: Callable[[BBEvent], TestResult],
+        delivery_mode: BBEventDeliveryMode = BBEventDeliveryMode.IMMEDIATE,
+        max_pending_events: int = 1000,
+        priority: int = 0,
+        filters: Iterable[BBEventFilter] = (),
+        once: bool = False,
+        weak: bool = False,
+        circuit_breaker: BBEventHandlerCircuitBreaker = None
+    ) -> BBEventHandler:
+        """register_handler(mod_identity, event_type, handler, delivery_mode=BBEventDeliveryMode.IMMEDIATE, max_pending_events=1000, priority=0, filters=(), once=False, weak=False, circuit_breaker=None)
 
         Register a handler of events.
 
@@ -80,22 +379,54 @@ class BBEventHandlerRegistry(metaclass=BBSingleton):
         :type mod_identity: BBModIdentity
         :param event_type: The type of events to be handled.
         :type event_type: Type[BBEvent]
-        :param handler: A function listening for events.
+        :param handler: A function listening for events. When the delivery mode is DEFERRED, the function receives a list of events.
         :type handler: Callable[[BBEvent], TestResult]
+        :param delivery_mode: How events are delivered to the handler. Default is IMMEDIATE.
+        :type delivery_mode: BBEventDeliveryMode, optional
+        :param max_pending_events: The maximum number of events kept while waiting for deferred delivery. When full, the oldest events are dropped. Default is 1000.
+        :type max_pending_events: int, optional
+        :param priority: Handlers with a higher priority receive events before handlers with a lower priority. Handlers with the same priority receive events in the order they were registered. Default is 0.
+        :type priority: int, optional
+        :param filters: Filters an event must pass before it is given to the handler. They are checked by the registry, so events failing them never reach the handling function. Default is no filters.
+        :type filters: Iterable[BBEventFilter], optional
+        :param once: If True, the handler is unregistered after it handles an event successfully. A handler that yields counts as successful once it has started. Default is False.
+        :type once: bool, optional
+        :param weak: If True, only a weak reference to the handling function is kept and the handler is unregistered once the function, or the object a bound method belongs to, is garbage collected. Default is False.
+        :type weak: bool, optional
+        :param circuit_breaker: Suspends the handler when it fails too often within a short time, logging a single report instead of an error per event. If None, a circuit breaker with default settings is used. Default is None.
+        :type circuit_breaker: BBEventHandlerCircuitBreaker, optional
         :return: An event handler that will receive events.
         :rtype: BBEventHandler
         """
-        event_handler = BBEventHandler(mod_identity, event_type, handler)
-        self._event_handlers.append(event_handler)
+        handle_id = next(self._registration_counter)
+        event_handler = BBEventHandler(mod_identity, event_type, handler, delivery_mode=delivery_mode, max_pending_events=max_pending_events, priority=priority, filters=filters, once=once, weak=weak, handle_id=handle_id, circuit_breaker=circuit_breaker)
+        if self._has_unregistered_event_handlers:
+            self._remove_unregistered_event_handlers()
+        sort_key = (-priority, handle_id)
+        index = bisect_right(self._event_handler_sort_keys, sort_key)
+        self._event_handler_sort_keys.insert(index, sort_key)
+        self._event_handlers.insert(index, event_handler)
+        self._event_handlers_by_handle_id[handle_id] = event_handler
+        self._event_handlers_by_event_type.clear()
         return event_handler
 
-    def unregister_handler(self, event_handler: BBEventHandler):
+    def unregister_handler(self, event_handler: Union[BBEventHandler, int]):
         """unregister_handler(event_handler)
 
-        Unregister a handler manually from receiving events.
+        Unregister a handler manually from receiving events. Handlers it yielded from are no longer continued.
 
-        :param event_handler: The event handler being unregistered.
-        :type event_handler: BBEventHandler
+        :param event_handler: The event handler being unregistered or its handle id.
+        :type event_handler: Union[BBEventHandler, int]
         """
-        if event_handler in self._event_handlers:
-            self._event_handlers.remove(event_handler)
+        handle_id = event_handler if isinstance(event_handler, int) else event_handler.handle_id
+        self._unregister_handler(handle_id)
+
+    def _unregister_handler(self, handle_id: int, cancel_scheduled: bool = True) -> None:
+        event_handler = self._event_handlers_by_handle_id.pop(handle_id, None)
+        if event_handler is None:
+            return
+        if cancel_scheduled:
+            self._scheduler.cancel(event_handler)
+        event_handler._on_unregistered()
+        self._has_unregistered_event_handlers = True
+        self._event_handlers_by_event_type.clear()
@@ -0,0 +1,215 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Generator, Tuple, Union, Any
+
+from bluuberrylibrary.events.event_handling.bb_event_handler import BBEventHandler
+from bluuberrylibrary.events.event_handling.bb_event_handler_profiler import BBEventHandlerProfiler
+from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
+
+
+class BBEventHandlerScheduler:
+    """BBEventHandlerScheduler(clock=time.perf_counter, default_time_budget_milliseconds=2.0)
+
+    Continues handlers that yield while handling an event, a little at a time across Zone updates.
+
+    Each mod gets its own time budget per Zone update. Handlers of a mod are continued one after another, in the order they were scheduled, until the budget is used up.
+    Every mod with scheduled handlers advances at least one step per Zone update, even if that single step exceeds its budget.
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        @BBEventHandlerRegistry.register(ModIdentity(), BBOnZoneLoadEndEvent)
+        def _bbl_scan_all_sims(event: BBOnZoneLoadEndEvent):
+            for sim_info in BBSimUtils.get_all_sim_info_gen():
+                _do_expensive_work(sim_info)
+                # Give control back to the game, the scan continues on the next Zone update if the time budget is used up.
+                yield
+            return BBRunResult.TRUE
+
+        BBEventHandlerRegistry().scheduler.set_time_budget(ModIdentity(), 1.0)
+
+    :param clock: A function returning the current time in seconds. Default is time.perf_counter.
+    :type clock: Callable[[], float], optional
+    :param default_time_budget_milliseconds: The time budget of mods that have not set their own. Default is 2.0.
+    :type default_time_budget_milliseconds: float, optional
+    """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, default_time_budget_milliseconds: float = 2.0):
+        self._clock = clock
+        self._default_time_budget = default_time_budget_milliseconds / 1000.0
+        self._time_budgets: Dict[str, float] = dict()
+        self._scheduled_handlers: Dict[str, Deque[Tuple[BBEventHandler, Generator[Any, None, Any]]]] = dict()
+
+    @property
+    def has_scheduled_handlers(self) -> bool:
+        """True, if any handlers are waiting to be continued. False, if not."""
+        return len(self._scheduled_handlers) > 0
+
+    def set_time_budget(self, mod_identity: BBModIdentity, milliseconds: float) -> None:
+        """set_time_budget(mod_identity, milliseconds)
+
+        Set the time the handlers of a mod may run for during a single Zone update.
+
+        :param mod_identity: The identity of the mod.
+        :type mod_identity: BBModIdentity
+        :param milliseconds: The time budget in milliseconds.
+        :type milliseconds: float
+        """
+        self._time_budgets[mod_identity.mod_name] = milliseconds / 1000.0
+
+    def get_time_budget(self, mod_identity: BBModIdentity) -> float:
+        """get_time_budget(mod_identity)
+
+        Retrieve the time the handlers of a mod may run for during a single Zone update.
+
+        :param mod_identity: The identity of the mod.
+        :type mod_identity: BBModIdentity
+        :return: The time budget in milliseconds.
+        :rtype: float
+        """
+        return self._time_budgets.get(mod_identity.mod_name, self._default_time_budget) * 1000.0
+
+    def schedule(self, event_handler: BBEventHandler, generator: Generator[Any, None, Any]) -> None:
+        """schedule(event_handler, generator)
+
+        Schedule a handler to be continued during the next Zone updates.
+
+        :param event_handler: The handler that created the generator.
+        :type event_handler: BBEventHandler
+        :param generator: The generator returned by the handler.
+        :type generator: Generator[Any, None, Any]
+        """
+        mod_name = event_handler.mod_identity.mod_name
+        scheduled_handlers = self._scheduled_handlers.get(mod_name, None)
+        if scheduled_handlers is None:
+            scheduled_handlers = deque()
+            self._scheduled_handlers[mod_name] = scheduled_handlers
+        scheduled_handlers.append((event_handler, generator))
+
+    def run(self, profiler: Union[BBEventHandlerProfiler, None] = None) -> None:
+        """run(profiler=None)
+
+        Continue scheduled handlers until each mod has used up its time budget.
+
+        :param profiler: If specified, each step of a handler is recorded as a call of that handler. Default is None.
+        :type profiler: BBEventHandlerProfiler, optional
+        """
+        if not self._scheduled_handlers:
+            return
+        for mod_name in tuple(self._scheduled_handlers.keys()):
+            # Handlers cancelled while others run, such as when they are suspended, are no longer scheduled.
+            scheduled_handlers = self._scheduled_handlers.get(mod_name, None)
+            if not scheduled_handlers:
+                continue
+            deadline = self._clock() + self._time_budgets.get(mod_name, self._default_time_budget)
+            while scheduled_handlers:
+                (event_handler, generator) = scheduled_handlers[0]
+                self._continue_handler(scheduled_handlers, event_handler, generator, profiler)
+                if self._clock() >= deadline:
+                    break
+            if not scheduled_handlers and self._scheduled_handlers.get(mod_name, None) is scheduled_handlers:
+                del self._scheduled_handlers[mod_name]
+
+    def finish(self, profiler: Union[BBEventHandlerProfiler, None] = None, max_steps_per_handler: int = 1000) -> None:
+        """finish(profiler=None, max_steps_per_handler=1000)
+
+        Continue scheduled handlers until they are done, without a time budget.
+
+        .. note:: This is done automatically when a Zone unloads, so handlers of the unload events still run before the Zone is gone.
+
+        :param profiler: If specified, each step of a handler is recorded as a call of that handler. Default is None.
+        :type profiler: BBEventHandlerProfiler, optional
+        :param max_steps_per_handler: The number of steps a handler gets to finish. Handlers still not done after that many steps are logged and closed. Default is 1000.
+        :type max_steps_per_handler: int, optional
+        """
+        # Handlers may schedule more handlers while they finish.
+        while self._scheduled_handlers:
+            mod_name = next(iter(self._scheduled_handlers))
+            scheduled_handlers = self._scheduled_handlers[mod_name]
+            while scheduled_handlers:
+                (event_handler, generator) = scheduled_handlers[0]
+                step_count = 0
+                while self._continue_handler(scheduled_handlers, event_handler, generator, profiler):
+                    step_count += 1
+                    if step_count >= max_steps_per_handler:
+                        scheduled_handlers.popleft()
+                        self._close_generator(generator)
+                        from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+                        _log = BBLogRegistry().register_log(event_handler.mod_identity, 'bb_event_dispatcher')
+                        _log.warn(f'{event_handler.handler_name} was not done handling an event after {max_steps_per_handler} steps and was closed.', event_handler=event_handler)
+                        break
+            if self._scheduled_handlers.get(mod_name, None) is scheduled_handlers:
+                del self._scheduled_handlers[mod_name]
+
+    @staticmethod
+    def _continue_handler(scheduled_handlers: Deque[Tuple[BBEventHandler, Generator[Any, None, Any]]], event_handler: BBEventHandler, generator: Generator[Any, None, Any], profiler: Union[BBEventHandlerProfiler, None]) -> bool:
+        # Returns True, if the handler yielded and is still scheduled.
+        try:
+            if profiler is None:
+                next(generator)
+            else:
+                profiler.measure(event_handler, next, generator)
+            return bool(scheduled_handlers) and scheduled_handlers[0][1] is generator
+        except StopIteration:
+            pass
+        except Exception as ex:
+            from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
+            BBEventHandlerRegistry()._on_handler_error(event_handler, None, ex, action='continuing to handle an event')
+        # A handler that unregistered or cancelled itself during the step was already removed, along with its generator.
+        if scheduled_handlers and scheduled_handlers[0][1] is generator:
+            scheduled_handlers.popleft()
+        return False
+
+    def cancel(self, event_handler: BBEventHandler) -> None:
+        """cancel(event_handler)
+
+        Stop continuing a handler. Its generators are closed.
+
+        :param event_handler: The handler to stop.
+        :type event_handler: BBEventHandler
+        """
+        mod_name = event_handler.mod_identity.mod_name
+        scheduled_handlers = self._scheduled_handlers.get(mod_name, None)
+        if not scheduled_handlers:
+            return
+        cancelled_generators = [generator for (scheduled_event_handler, generator) in scheduled_handlers if scheduled_event_handler is event_handler]
+        if not cancelled_generators:
+            return
+        # Changed in place, since the handlers may be cancelled while they are being run.
+        remaining_handlers = [(scheduled_event_handler, generator) for (scheduled_event_handler, generator) in scheduled_handlers if scheduled_event_handler is not event_handler]
+        scheduled_handlers.clear()
+        scheduled_handlers.extend(remaining_handlers)
+        if not scheduled_handlers:
+            del self._scheduled_handlers[mod_name]
+        for generator in cancelled_generators:
+            self._close_generator(generator)
+
+    def cancel_all(self) -> None:
+        """cancel_all()
+
+        Stop continuing all handlers. Their generators are closed.
+        """
+        scheduled_handlers_by_mod_name = self._scheduled_handlers
+        self._scheduled_handlers = dict()
+        for scheduled_handlers in scheduled_handlers_by_mod_name.values():
+            cancelled_handlers = tuple(scheduled_handlers)
+            scheduled_handlers.clear()
+            for (_, generator) in cancelled_handlers:
+                self._close_generator(generator)
+
+    @staticmethod
+    def _close_generator(generator: Generator[Any, None, Any]) -> None:
+        # noinspection PyBroadException
+        try:
+            generator.close()
+        except Exception:
+            # A generator cancelling itself is still running and cannot be closed, it is dropped instead.
+            pass
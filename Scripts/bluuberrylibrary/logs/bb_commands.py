@@ -11,18 +11,23 @@ from sims4.commands import Command, CommandType
 
 @Command(
     'bbl.enable_log',
-    # 'Enable a log. Once enabled, the log will write messages to "The Sims 4/bb_logs/modname_version_Debug.txt"',
+    # 'Enable a log. Once enabled, the log will write messages to "The Sims 4/bb_logs/modname_version_Debug.txt". Wildcards enable several logs, such as modname.* for every log of a mod. Specify trace, debug, info, warn or error as the level to only write messages from that level up.',
     command_type=CommandType.Live
 )
-def _bbl_command_enable_log(log_name: str, _connection: int = None):
+def _bbl_command_enable_log(log_name: str, level: str = 'debug', _connection: int = None):
     from sims4.commands import CheatOutput
     output = CheatOutput(_connection)
     if log_name is None:
         output('ERROR: No log name specified.')
         return
-    output(f'Attempting to enable log \'{log_name}\'.')
+    from bluuberrylibrary.logs.bb_log_level import BBLogLevel
+    log_level = getattr(BBLogLevel, str(level).upper(), None)
+    if not isinstance(log_level, BBLogLevel):
+        output(f'ERROR: Unknown log level \'{level}\'. Use trace, debug, info, warn or error.')
+        return
+    output(f'Attempting to enable log \'{log_name}\' at level {log_level.name}.')
     from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-    if BBLogRegistry().enable_logs(log_name):
+    if BBLogRegistry().enable_logs(log_name, level=log_level):
         output(f'SUCCESS: Log \'{log_name}\' was successfully enabled.')
     else:
         output(f'FAILED: Failed to enable log \'{log_name}\'.')
@@ -30,7 +35,7 @@ def _bbl_command_enable_log(log_name: str, _connection: int = None):
 
 @Command(
     'bbl.disable_log',
-    # 'Disable a log. Once disabled, the log will no longer write any messages.',
+    # 'Disable a log. Once disabled, the log will no longer write any messages except errors. Wildcards disable several logs, such as modname.* for every log of a mod.',
     command_type=CommandType.Live
 )
 def _bbl_command_disable_log(log_name: str, _connection: int = None):
@@ -47,6 +52,75 @@ def _bbl_command_disable_log(log_name: str, _connection: int = None):
         output(f'Failed to disable log \'{log_name}\'.')
 
 
+@Command(
+    'bbl.enable_flight_recorder',
+    # 'Keep the most recent messages of a log in memory instead of writing them, and write them to "The Sims 4/bb_logs/modname_version_Debug.txt" when an error occurs in the same mod or with bbl.dump_log. Wildcards select several logs, such as modname.* for every log of a mod.',
+    command_type=CommandType.Live
+)
+def _bbl_command_enable_flight_recorder(log_name: str, max_record_count: int = 1000, level: str = 'debug', _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    if log_name is None:
+        output('ERROR: No log name specified.')
+        return
+    from bluuberrylibrary.logs.bb_log_level import BBLogLevel
+    log_level = getattr(BBLogLevel, str(level).upper(), None)
+    if not isinstance(log_level, BBLogLevel):
+        output(f'ERROR: Unknown log level \'{level}\'. Use trace, debug, info, warn or error.')
+        return
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    logs = BBLogRegistry().get_logs(log_name)
+    if not logs:
+        output(f'FAILED: No logs found matching \'{log_name}\'.')
+        return
+    for log in logs:
+        log.enable_flight_recorder(max_record_count=max_record_count, level=log_level)
+    output(f'SUCCESS: Recording the last {max_record_count} message(s) of {len(logs)} log(s) at level {log_level.name}.')
+
+
+@Command(
+    'bbl.disable_flight_recorder',
+    # 'Stop keeping the most recent messages of a log in memory. Wildcards select several logs, such as modname.* for every log of a mod.',
+    command_type=CommandType.Live
+)
+def _bbl_command_disable_flight_recorder(log_name: str, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    if log_name is None:
+        output('ERROR: No log name specified.')
+        return
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    logs = [log for log in BBLogRegistry().get_logs(log_name) if log.is_flight_recorder_enabled]
+    if not logs:
+        output(f'FAILED: No logs with a flight recorder found matching \'{log_name}\'.')
+        return
+    for log in logs:
+        log.disable_flight_recorder()
+    output(f'SUCCESS: Stopped recording {len(logs)} log(s).')
+
+
+@Command(
+    'bbl.dump_log',
+    # 'Write the messages kept in memory by the flight recorder of a log to "The Sims 4/bb_logs/modname_version_Debug.txt". Wildcards select several logs, such as modname.* for every log of a mod.',
+    command_type=CommandType.Live
+)
+def _bbl_command_dump_log(log_name: str, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    if log_name is None:
+        output('ERROR: No log name specified.')
+        return
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    logs = [log for log in BBLogRegistry().get_logs(log_name) if log.is_flight_recorder_enabled]
+    if not logs:
+        output(f'FAILED: No logs with a flight recorder found matching \'{log_name}\'. Enable one with bbl.enable_flight_recorder')
+        return
+    record_count = 0
+    for log in logs:
+        record_count += log.dump_flight_recorder(reason='bbl.dump_log')
+    output(f'SUCCESS: Wrote {record_count} message(s) from {len(logs)} log(s).')
+
+
 @Command('bbl.test_log', command_type=CommandType.Live)
 def _bbl_command_test_log(_connection: int = None):
     from sims4.commands import CheatOutput
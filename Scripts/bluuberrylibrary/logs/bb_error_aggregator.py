@@ -0,0 +1,177 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Type
+
+from bluuberrylibrary.classes.bb_singleton import BBSingleton
+from bluuberrylibrary.logs.bb_log_writer import BBLogWriter
+from bluuberrylibrary.logs.bb_stacktrace_utils import BBCapturedStack
+from bluuberrylibrary.utils.time.bb_date_utils import BBDateTimeUtils
+
+# Numbers and addresses in a message, which are replaced to get the template of the message.
+_MESSAGE_VARIABLE_PATTERN = re.compile(r'0x[0-9a-fA-F]+|\d+')
+
+
+class _BBAggregatedError:
+    # An error written once, along with how many times it happened again.
+    def __init__(self, mod_name: str, log_name: str, message_template: str, exception_type_name: str, location: str, json_lines: bool):
+        self.mod_name = mod_name
+        self.log_name = log_name
+        self.message_template = message_template
+        self.exception_type_name = exception_type_name
+        self.location = location
+        self.json_lines = json_lines
+        # Occurrences after the first one, in total and since the last summary.
+        self.repeat_count = 0
+        self.unreported_repeat_count = 0
+
+
+class BBErrorAggregator(metaclass=BBSingleton):
+    """BBErrorAggregator(summary_interval_seconds=300.0, max_error_count=1000, top_frame_count=3, clock=time.monotonic)
+
+    Keeps errors that happen over and over from flooding the exception files of logs.
+
+    Errors are told apart by the type of their exception, the template of their message, which is the message with its numbers replaced, and the innermost frames of their stack trace.
+    The first occurrence of an error is written in full, later ones are only counted in memory.
+    A summary table of the repeated errors is written to the exception file every `summary_interval_seconds` while errors keep happening.
+
+    .. note:: The summary is also written when the zone unloads and when the game exits.
+
+    :param summary_interval_seconds: The number of seconds between summaries. Default is 300.0.
+    :type summary_interval_seconds: float, optional
+    :param max_error_count: The maximum number of distinct errors remembered. When reached, a summary is written and the errors are forgotten, so they are written in full again. Default is 1000.
+    :type max_error_count: int, optional
+    :param top_frame_count: The number of innermost frames that tell errors apart. Default is 3.
+    :type top_frame_count: int, optional
+    :param clock: A function returning the current time in seconds. Default is time.monotonic.
+    :type clock: Callable[[], float], optional
+    """
+    def __init__(self, summary_interval_seconds: float = 300.0, max_error_count: int = 1000, top_frame_count: int = 3, clock: Callable[[], float] = time.monotonic):
+        self._summary_interval_seconds = summary_interval_seconds
+        self._max_error_count = max_error_count
+        self._top_frame_count = top_frame_count
+        self._clock = clock
+        self._last_summary_time = clock()
+        # The errors of each file, by fingerprint.
+        self._errors_by_file_path: Dict[str, Dict[Hashable, _BBAggregatedError]] = dict()
+        self._error_count = 0
+        self._lock = threading.RLock()
+        atexit.register(self.write_summary)
+
+    @property
+    def error_count(self) -> int:
+        """The number of distinct errors remembered."""
+        return self._error_count
+
+    def add_error(self, file_path: str, mod_name: str, log_name: str, message: str, captured_stack: BBCapturedStack, exception_type: Type[BaseException] = None, json_lines: bool = False) -> bool:
+        """add_error(file_path, mod_name, log_name, message, captured_stack, exception_type=None, json_lines=False)
+
+        Count an error about to be written.
+
+        :param file_path: The exception file the error is written to.
+        :type file_path: str
+        :param mod_name: The name of the mod logging the error.
+        :type mod_name: str
+        :param log_name: The name of the log the error is logged with.
+        :type log_name: str
+        :param message: The message of the error.
+        :type message: str
+        :param captured_stack: The stack trace of the error.
+        :type captured_stack: BBCapturedStack
+        :param exception_type: The type of the exception of the error. If not specified, the type of the exception captured with the stack trace is used. Default is None.
+        :type exception_type: Type[BaseException], optional
+        :param json_lines: If True, the summary is written to the file as JSON lines. Default is False.
+        :type json_lines: bool, optional
+        :return: True, if this is the first occurrence of the error and it should be written in full. False, if it was counted instead.
+        :rtype: bool
+        """
+        if exception_type is None:
+            exception_type = captured_stack.exception_type
+        message_template = _MESSAGE_VARIABLE_PATTERN.sub('#', str(message))
+        top_frames = captured_stack.frames[-self._top_frame_count:]
+        fingerprint = (exception_type, message_template, top_frames)
+        with self._lock:
+            errors = self._errors_by_file_path.get(file_path, None)
+            if errors is None:
+                errors = dict()
+                self._errors_by_file_path[file_path] = errors
+            error = errors.get(fingerprint, None)
+            if error is None:
+                if self._error_count >= self._max_error_count:
+                    self.write_summary()
+                    self._errors_by_file_path.clear()
+                    self._error_count = 0
+                    errors = dict()
+                    self._errors_by_file_path[file_path] = errors
+                exception_type_name = exception_type.__name__ if exception_type is not None else ''
+                location = ''
+                if top_frames:
+                    (code, line_number) = top_frames[-1]
+                    location = '{}:{} in {}'.format(os.path.basename(code.co_filename), line_number, code.co_name)
+                errors[fingerprint] = _BBAggregatedError(mod_name, log_name, message_template, exception_type_name, location, json_lines)
+                self._error_count += 1
+                return True
+            error.repeat_count += 1
+            error.unreported_repeat_count += 1
+            if self._clock() - self._last_summary_time >= self._summary_interval_seconds:
+                self.write_summary()
+            return False
+
+    def write_summary(self) -> None:
+        """write_summary()
+
+        Write a table of the errors repeated since the last summary to their exception files.
+        """
+        with self._lock:
+            self._last_summary_time = self._clock()
+            for (file_path, errors) in self._errors_by_file_path.items():
+                repeated_errors = [error for error in errors.values() if error.unreported_repeat_count > 0]
+                if not repeated_errors:
+                    continue
+                repeated_errors.sort(key=lambda _error: _error.unreported_repeat_count, reverse=True)
+                if repeated_errors[0].json_lines:
+                    summary_text = self._format_json_lines_summary(repeated_errors)
+                else:
+                    summary_text = self._format_text_summary(repeated_errors)
+                for error in repeated_errors:
+                    error.unreported_repeat_count = 0
+                BBLogWriter().write(file_path, summary_text, flush=True)
+
+    def _format_text_summary(self, repeated_errors: List[_BBAggregatedError]) -> str:
+        current_date_time_str = BBDateTimeUtils.get_current_real_date_time_string()
+        lines = [
+            '[{}] {} Errors repeated since the last summary, each was written in full the first time it happened:\n'.format(repeated_errors[0].mod_name, current_date_time_str),
+            '  {:>8} {:>8}  {}\n'.format('Repeats', 'Total', 'Error'),
+        ]
+        for error in repeated_errors:
+            error_text = '{}: {}'.format(error.exception_type_name, error.message_template) if error.exception_type_name else error.message_template
+            lines.append('  {:>8} {:>8}  [{}] {} {}\n'.format(error.unreported_repeat_count, error.repeat_count, error.log_name, error.location, error_text))
+        lines.append('\n')
+        return ''.join(lines)
+
+    def _format_json_lines_summary(self, repeated_errors: List[_BBAggregatedError]) -> str:
+        current_date_time_str = BBDateTimeUtils.get_current_real_date_time().isoformat()
+        lines = list()
+        for error in repeated_errors:
+            lines.append(json.dumps({
+                'timestamp': current_date_time_str,
+                'level': 'ERROR_SUMMARY',
+                'log': error.log_name,
+                'mod': error.mod_name,
+                'message': error.message_template,
+                'exception_type': error.exception_type_name,
+                'location': error.location,
+                'repeats': error.unreported_repeat_count,
+                'total_repeats': error.repeat_count,
+            }) + '\n')
+        return ''.join(lines)
@@ -5,25 +5,78 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
-from typing import Any
+import atexit
+import time
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Any, Deque, Dict, Iterable, List, Tuple
 
+from bluuberrylibrary.classes.bb_run_result import BBRunResult
 from bluuberrylibrary.classes.bb_singleton import BBSingleton
+from bluuberrylibrary.events.event_dispatchers.zone.events.bb_on_zone_unload_start_event import BBOnZoneUnloadStartEvent
+from bluuberrylibrary.events.event_handling.bb_event_handler_registry import BBEventHandlerRegistry
 from bluuberrylibrary.logs.bb_log import BBLog
+from bluuberrylibrary.logs.bb_log_level import BBLogLevel
 from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+from bluuberrylibrary.logs.bb_log_writer import BBLogWriter
 from bluuberrylibrary.mod_identity import ModIdentity
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
+from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
 from bluuberrylibrary.utils.debug.bb_injection_utils import BBInjectionUtils
 from sims4.commands import Command, CommandType
-from sims4.log import Logger
+from sims4.log import Logger, LEVEL_DEBUG, LEVEL_INFO, LEVEL_WARN, LEVEL_ERROR
+
+_DEBUG = int(BBLogLevel.DEBUG)
+_INFO = int(BBLogLevel.INFO)
+_WARN = int(BBLogLevel.WARN)
+
+# The levels of the game, as passed to Logger.log, and the levels they are written at.
+_GAME_LOG_LEVELS = {
+    LEVEL_DEBUG: BBLogLevel.DEBUG,
+    LEVEL_INFO: BBLogLevel.INFO,
+    LEVEL_WARN: BBLogLevel.WARN,
+    LEVEL_ERROR: BBLogLevel.ERROR
+}
+
+
+def _to_bb_log_level(level: int) -> BBLogLevel:
+    bb_log_level = _GAME_LOG_LEVELS.get(level, None)
+    if bb_log_level is not None:
+        return bb_log_level
+    # Levels above error, such as fatal, are errors too.
+    if level is not None and level > LEVEL_ERROR:
+        return BBLogLevel.ERROR
+    return BBLogLevel.DEBUG
 
 
 class _BBGameLogs(metaclass=BBSingleton):
+    # Captures the messages of the game's Loggers.
+    #
+    # Messages are kept unformatted in a single ring buffer shared by all groups and only formatted when the buffer is written,
+    # which happens once it holds FLUSH_RECORD_COUNT messages, once FLUSH_INTERVAL_SECONDS pass or when the logs are disabled.
+    # Groups are filtered before a message is buffered, the result being cached per group. Errors bypass the buffer.
+    FLUSH_RECORD_COUNT = 10000
+    FLUSH_INTERVAL_SECONDS = 1.0
+
     def __init__(self) -> None:
         self.logs_enabled = False
+        self.level = BBLogLevel.DEBUG
+        # The level as a plain integer, so messages below it are skipped with a single comparison, before being formatted.
+        self.level_threshold = int(BBLogLevel.DEBUG)
         self.game_log_identities = dict()
-        self.logs = list()
+        self.logs: Dict[str, BBLog] = dict()
+        self._allowed_group_patterns: Tuple[str, ...] = ('*',)
+        self._denied_group_patterns: Tuple[str, ...] = tuple()
+        self._group_filter_results: Dict[str, bool] = dict()
+        # Each record is (time, level name, group, message, args, owner).
+        self._records: Deque[Tuple[float, str, str, str, Tuple[Any, ...], Any]] = deque(maxlen=self.FLUSH_RECORD_COUNT)
+        self._last_flush_time = time.time()
+        atexit.register(self.flush)
 
     def get_log(self, log_name: str) -> BBLog:
+        _log = self.logs.get(log_name, None)
+        if _log is not None:
+            return _log
         if log_name not in self.game_log_identities:
             class TempModIdentity(BBModIdentity):
                 _FILE_PATH: str = str(__file__)
@@ -54,79 +107,128 @@ class _BBGameLogs(metaclass=BBSingleton):
             mod_identity = self.game_log_identities[log_name]
 
         _log = BBLogRegistry().register_log(mod_identity, f'log', override_logging_path='game_logs')
-        _log.enable()
-        self.logs.append(_log)
+        _log.enable(level=self.level)
+        self.logs[log_name] = _log
         return _log
 
     def _format_message(self, message, *args, owner=None, **__) -> str:
         to_log_message = message
         if args:
-            to_log_message = to_log_message.format(*args)
+            # noinspection PyBroadException
+            try:
+                to_log_message = to_log_message.format(*args)
+            except Exception:
+                to_log_message = '{} {}'.format(to_log_message, args)
         if owner:
             to_log_message = f'[{owner}] {to_log_message}'
         return to_log_message
 
-    def enable_logs(self) -> None:
+    def enable_logs(self, level: BBLogLevel = BBLogLevel.DEBUG) -> None:
+        self.level = level
+        self.level_threshold = int(level)
+        for _log in self.logs.values():
+            _log.enable(level=level)
         self.logs_enabled = True
+        BBInjectionRegistry().refresh_injections()
 
     def disable_logs(self) -> None:
+        self.flush()
         self.logs_enabled = False
-
-    def _log(self, log_name: str, message: str, *args, level, owner=None, **kwargs) -> Any:
-        if not self.logs_enabled:
+        BBInjectionRegistry().refresh_injections()
+
+    def set_group_filter(self, allowed_group_patterns: Iterable[str] = ('*',), denied_group_patterns: Iterable[str] = tuple()) -> None:
+        # A group is captured when it matches an allowed pattern and no denied pattern.
+        self._allowed_group_patterns = tuple(pattern.lower() for pattern in allowed_group_patterns)
+        self._denied_group_patterns = tuple(pattern.lower() for pattern in denied_group_patterns)
+        self._group_filter_results.clear()
+
+    def _is_group_allowed(self, log_name: str) -> bool:
+        group_name = str(log_name).lower()
+        is_allowed = any(fnmatchcase(group_name, pattern) for pattern in self._allowed_group_patterns) and not any(fnmatchcase(group_name, pattern) for pattern in self._denied_group_patterns)
+        self._group_filter_results[log_name] = is_allowed
+        return is_allowed
+
+    def _capture(self, level_threshold: int, level_name: str, log_name: str, message: str, args: Tuple[Any, ...], owner) -> None:
+        if level_threshold < self.level_threshold:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
-        _log.debug(f'{level}: {to_log_message}')
-
-    def _debug(self, log_name: str, message: str, *args, owner=None, **kwargs) -> Any:
-        if not self.logs_enabled:
+        is_allowed = self._group_filter_results.get(log_name, None)
+        if is_allowed is None:
+            is_allowed = self._is_group_allowed(log_name)
+        if not is_allowed:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
-        _log.debug(to_log_message)
-
-    def _info(self, log_name: str, message: str, *args, owner=None, **kwargs) -> Any:
-        if not self.logs_enabled:
+        records = self._records
+        now = time.time()
+        records.append((now, level_name, log_name, message, args, owner))
+        if len(records) >= self.FLUSH_RECORD_COUNT or now - self._last_flush_time >= self.FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        records = self._records
+        self._records = deque(maxlen=self.FLUSH_RECORD_COUNT)
+        self._last_flush_time = time.time()
+        if not records:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
-        _log.debug(to_log_message)
+        lines_by_log_name: Dict[str, List[str]] = dict()
+        # Records are in chronological order, so the date and time up to the second is only formatted once per second.
+        record_second = None
+        record_second_str = None
+        for (record_time, level_name, log_name, message, args, owner) in records:
+            lines = lines_by_log_name.get(log_name, None)
+            if lines is None:
+                lines = list()
+                lines_by_log_name[log_name] = lines
+            if int(record_time) != record_second:
+                record_second = int(record_time)
+                record_second_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record_second))
+            lines.append('{}.{:06d} {}: [log]: {}\n'.format(record_second_str, int((record_time - record_second) * 1000000), level_name, self._format_message(message, *args, owner=owner)))
+        for (log_name, lines) in lines_by_log_name.items():
+            _log = self.get_log(log_name)
+            BBLogWriter().write(_log._get_file_path(_log._debug_file_name()), ''.join(lines))
 
-    def _warn(self, log_name: str, message: str, *args, owner=None, **kwargs) -> Any:
+    def _log(self, log_name: str, message: str, *args, level, owner=None, **kwargs) -> Any:
         if not self.logs_enabled:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
-        _log.debug(to_log_message)
+        bb_log_level = _to_bb_log_level(level)
+        if bb_log_level == BBLogLevel.ERROR:
+            self._error(log_name, message, *args, owner=owner, **kwargs)
+        else:
+            self._capture(int(bb_log_level), bb_log_level.name, log_name, message, args, owner)
 
     def _error(self, log_name: str, message: str, *args, owner=None, **kwargs) -> Any:
         if not self.logs_enabled:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
+        _log = self.get_log(log_name)
+        to_log_message = self._format_message(message, *args, owner=owner, **kwargs)
         _log.error(to_log_message)
 
     def _exception(self, log_name: str, message: str, *args, exc: Exception = None, owner=None, **kwargs) -> Any:
         if not self.logs_enabled:
             return
-        _log = _BBGameLogs().get_log(log_name)
-        to_log_message = _BBGameLogs()._format_message(message, *args, owner=owner, **kwargs)
+        _log = self.get_log(log_name)
+        to_log_message = self._format_message(message, *args, owner=owner, **kwargs)
         _log.error(to_log_message, exception=exc, throw=True)
 
 
+_bbl_game_logs = _BBGameLogs()
+
+
 @Command(
     'bbl.enable_game_logs',
+    # 'Write the logs of the game to "The Sims 4/bb_logs/game_logs". Specify debug, info, warn or error as the level to only write messages from that level up.',
     command_type=CommandType.Live
 )
-def _bbl_command_enable_game_log(_connection: int = None):
+def _bbl_command_enable_game_log(level: str = 'debug', _connection: int = None):
     from sims4.commands import CheatOutput
     output = CheatOutput(_connection)
-    output('Enabling the Game Logs.')
-    if _BBGameLogs().logs_enabled:
+    log_level = getattr(BBLogLevel, str(level).upper(), None)
+    if not isinstance(log_level, BBLogLevel):
+        output(f'ERROR: Unknown log level \'{level}\'. Use debug, info, warn or error.')
+        return
+    output(f'Enabling the Game Logs at level {log_level.name}.')
+    if _BBGameLogs().logs_enabled and _BBGameLogs().level == log_level:
         output('The Game Logs are already enabled.')
         return
-    _BBGameLogs().enable_logs()
+    _BBGameLogs().enable_logs(level=log_level)
     output('Game Logs are now enabled.')
 
 
@@ -145,43 +247,63 @@ def _bbl_disable_game_logs(_connection: int = None):
     output('Game Logs are now disabled.')
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'log', log_errors=False)
+@Command(
+    'bbl.filter_game_logs',
+    # 'Choose which groups of the Game Logs are written. Both arguments are comma separated names that may contain wildcards, for example: bbl.filter_game_logs * Animation*,Routing',
+    command_type=CommandType.Live
+)
+def _bbl_filter_game_logs(allowed_groups: str = '*', denied_groups: str = '', _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    allowed_group_patterns = tuple(pattern.strip() for pattern in allowed_groups.split(',') if pattern.strip())
+    denied_group_patterns = tuple(pattern.strip() for pattern in denied_groups.split(',') if pattern.strip())
+    _BBGameLogs().set_group_filter(allowed_group_patterns=allowed_group_patterns, denied_group_patterns=denied_group_patterns)
+    output(f'Game Logs will write the groups matching \'{", ".join(allowed_group_patterns)}\' except \'{", ".join(denied_group_patterns)}\'.')
+
+
+# Runs after other handlers, so messages logged while they handle the event are written too.
+@BBEventHandlerRegistry.register(ModIdentity(), BBOnZoneUnloadStartEvent, priority=-1000)
+def _bbl_flush_game_logs_on_zone_unload_start(event: BBOnZoneUnloadStartEvent) -> BBRunResult:
+    _BBGameLogs().flush()
+    return BBRunResult.TRUE
+
+
+def _bbl_are_game_logs_enabled() -> bool:
+    return _BBGameLogs().logs_enabled
+
+
+# While the Game Logs are disabled, the Logger functions are left untouched.
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'log', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_log(original, self, message, *args, level, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._log(log_name, message, *args, level, owner=owner or self.default_owner, **kwargs)
-    return original(self, message, *args, level, owner=owner, **kwargs)
+    _bbl_game_logs._log(self.group, message, *args, level=level, owner=owner or self.default_owner, **kwargs)
+    return original(self, message, *args, level=level, owner=owner, **kwargs)
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'debug', log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'debug', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_debug(original, self, message, *args, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._debug(log_name, message, *args, owner=owner or self.default_owner, **kwargs)
+    _bbl_game_logs._capture(_DEBUG, 'DEBUG', self.group, message, args, owner or self.default_owner)
     return original(self, message, *args, owner=owner, **kwargs)
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'info', log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'info', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_info(original, self, message, *args, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._info(log_name, message, *args, owner=owner or self.default_owner, **kwargs)
+    _bbl_game_logs._capture(_INFO, 'INFO', self.group, message, args, owner or self.default_owner)
     return original(self, message, *args, owner=owner, **kwargs)
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'warn', log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'warn', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_warn(original, self, message, *args, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._warn(log_name, message, *args, owner=owner or self.default_owner, **kwargs)
+    _bbl_game_logs._capture(_WARN, 'WARN', self.group, message, args, owner or self.default_owner)
     return original(self, message, *args, owner=owner, **kwargs)
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'error', log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'error', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_error(original, self, message, *args, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._error(log_name, message, *args, owner=owner or self.default_owner, **kwargs)
+    _bbl_game_logs._error(self.group, message, *args, owner=owner or self.default_owner, **kwargs)
     return original(self, message, *args, owner=owner, **kwargs)
 
 
-@BBInjectionUtils.inject(ModIdentity(), Logger, 'exception', log_errors=False)
+@BBInjectionUtils.inject(ModIdentity(), Logger, 'exception', log_errors=False, enabled_when=_bbl_are_game_logs_enabled)
 def _bbl_logger_exception(original, self, message, *args, exc=None, owner=None, **kwargs) -> Any:
-    log_name = self.group
-    _BBGameLogs()._exception(log_name, message, *args, exc=exc, owner=owner or self.default_owner, **kwargs)
+    _bbl_game_logs._exception(self.group, message, *args, exc=exc, owner=owner or self.default_owner, **kwargs)
     return original(self, message, *args, exc=exc, owner=owner, **kwargs)
@@ -5,21 +5,76 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
+import json
 import os
+import time
+from collections import deque
+from datetime import datetime
 from pprint import pformat
-from typing import List
+from typing import Any, Callable, Deque, Dict, List, Tuple, Union
 
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
+from bluuberrylibrary.logs.bb_error_aggregator import BBErrorAggregator
+from bluuberrylibrary.logs.bb_log_level import BBLogLevel
+from bluuberrylibrary.logs.bb_log_output_format import BBLogOutputFormat
+from bluuberrylibrary.logs.bb_log_writer import BBLogWriter
 from bluuberrylibrary.logs.bb_stacktrace_utils import BBStacktraceUtils
-from bluuberrylibrary.utils.file.bb_file_utils import BBFileUtils
 from bluuberrylibrary.utils.time.bb_date_utils import BBDateTimeUtils
 
+# The levels as plain integers, so checking whether a message is logged is a single integer comparison.
+_TRACE = int(BBLogLevel.TRACE)
+_DEBUG = int(BBLogLevel.DEBUG)
+_INFO = int(BBLogLevel.INFO)
+_WARN = int(BBLogLevel.WARN)
+_ERROR = int(BBLogLevel.ERROR)
+# The logs with a flight recorder, by lower case mod name, so an error only looks at the logs of its own mod.
+_flight_recorder_logs: Dict[str, List['BBLog']] = dict()
+
 
 class BBLog:
     """BBLog(mod_identity, log_name, logging_file_path=None)
 
     A class used to log messages.
 
+    Messages that are expensive to build can be deferred until the log is known to be enabled, either by passing a function returning the message or by using :func:`debug_format`.
+    The `enabled` attribute is True while the log is enabled at any level below ERROR and is the cheapest way to check it before doing any other work. Use :func:`is_level_enabled` or :attr:`level` to check which messages are written.
+
+    Messages have a level, see :class:`.BBLogLevel`. An enabled log writes DEBUG messages and above, unless enabled at another level. A disabled log only writes errors.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        # Only write warnings and errors.
+        log.enable(level=BBLogLevel.WARN)
+        log.info('Not written.')
+        log.warn('Written.')
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        # The message is only formatted when the log is enabled.
+        log.debug_format('{} ({}): {}', sim_info, sim_id, text)
+        # The function is only invoked when the log is enabled.
+        log.debug(lambda: f'{sim_info} ({sim_id}): {text}')
+        # Skip gathering the data altogether when the log is disabled.
+        if log.enabled:
+            log.debug('Data', data=gather_data())
+
+    Logs can write JSON lines instead of text, which are easier to search and parse, and rotate their files once they grow too large.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        log.set_output_format(BBLogOutputFormat.JSON_LINES)
+        # Keep at most 5 files of 10 MB, compressing the old ones.
+        log.set_rotation(10 * 1024 * 1024, max_rotated_file_count=5, compress_rotated_files=True)
+        # Writes {"timestamp": "...", "level": "DEBUG", "log": "log_name", "mod": "ModName", "message": "Sim spawned", "fields": {"sim_id": 123}}
+        log.debug('Sim spawned', sim_id=123)
+
+    To diagnose a rare problem without writing every message to disk, a log can keep its most recent messages in memory and write them only when an error occurs in the same mod, see :func:`enable_flight_recorder`.
+
     :param mod_identity: The identity of the mod that owns the log.
     :type mod_identity: BBModIdentity
     :param log_name: The name of the log, used when enabling/disabling logs via commands
@@ -31,7 +86,19 @@ class BBLog:
         self._mod_identity = mod_identity
         self._log_name = log_name
         self._logging_file_path = logging_file_path
-        self._is_enabled = False
+        self.enabled = False
+        self._level = BBLogLevel.ERROR
+        self._level_threshold = _ERROR
+        # The lowest level handled at all, either written or recorded by the flight recorder. Checked by the level methods instead of `enabled`, which only reflects writing.
+        self._handled_threshold = _ERROR
+        # The time, level name, message, format arguments and keyword arguments of the most recent messages, or None if the flight recorder is disabled.
+        self._flight_recorder: Union[Deque[Tuple[float, str, Any, Union[Tuple[Any, ...], None], Dict[str, Any]]], None] = None
+        self._flight_recorder_threshold = _ERROR
+        self._output_format = BBLogOutputFormat.TEXT
+        # The arguments of BBLogWriter.set_rotation, excluding the file path, or None if the files of the log are not rotated.
+        self._rotation: Union[Dict[str, Any], None] = None
+        # Full file paths by file name, so they are not joined again for every message.
+        self._file_paths: Dict[str, str] = dict()
 
     @property
     def name(self) -> str:
@@ -51,9 +118,161 @@ class BBLog:
         """
         return self._mod_identity.mod_name
 
+    @property
+    def level(self) -> BBLogLevel:
+        """The lowest level of the messages the log writes. ERROR, if the log is disabled.
+
+        :return: The level of the log.
+        :rtype: BBLogLevel
+        """
+        return self._level
+
+    def set_level(self, level: BBLogLevel) -> None:
+        """set_level(level)
+
+        Change the lowest level of the messages the log writes. A level below ERROR enables the log, a level of ERROR disables it.
+
+        :param level: The lowest level to write.
+        :type level: BBLogLevel
+        """
+        self._level = level
+        self._level_threshold = int(level)
+        self._update_handled_threshold()
+
+    def is_level_enabled(self, level: BBLogLevel) -> bool:
+        """is_level_enabled(level)
+
+        Determine if the log writes messages of a level.
+
+        :param level: The level to check.
+        :type level: BBLogLevel
+        :return: True, if messages of the level are written. False, if not.
+        :rtype: bool
+        """
+        return self._level_threshold <= int(level)
+
+    @property
+    def output_format(self) -> BBLogOutputFormat:
+        """The format in which the log writes its messages.
+
+        :return: The output format of the log.
+        :rtype: BBLogOutputFormat
+        """
+        return self._output_format
+
+    def set_output_format(self, output_format: BBLogOutputFormat) -> None:
+        """set_output_format(output_format)
+
+        Change the format in which the log writes its messages. Each format writes to its own files.
+
+        :param output_format: The format to write messages in.
+        :type output_format: BBLogOutputFormat
+        """
+        self._output_format = output_format
+        self._file_paths.clear()
+
+    def set_rotation(self, max_file_size: int, max_rotated_file_count: int = 5, compress_rotated_files: bool = False) -> None:
+        """set_rotation(max_file_size, max_rotated_file_count=5, compress_rotated_files=False)
+
+        Rotate the files of the log once they reach a size. A rotated file is renamed to "name.1.ext", "name.2.ext" and so on.
+
+        .. note:: Rotation applies to every log writing to the same file, such as the other logs of the same mod.
+
+        :param max_file_size: The size in bytes a file is rotated at.
+        :type max_file_size: int
+        :param max_rotated_file_count: The number of rotated files kept, the oldest ones are deleted. Default is 5.
+        :type max_rotated_file_count: int, optional
+        :param compress_rotated_files: If True, rotated files are compressed with gzip on a separate thread, adding ".gz" to their name. Default is False.
+        :type compress_rotated_files: bool, optional
+        """
+        self._rotation = dict(max_file_size=max_file_size, max_rotated_file_count=max_rotated_file_count, compress_rotated_files=compress_rotated_files)
+        self._file_paths.clear()
+
+    @property
+    def is_flight_recorder_enabled(self) -> bool:
+        """True, if the log records its most recent messages in memory. False, if not."""
+        return self._flight_recorder is not None
+
+    def enable_flight_recorder(self, max_record_count: int = 1000, level: BBLogLevel = BBLogLevel.DEBUG) -> None:
+        """enable_flight_recorder(max_record_count=1000, level=BBLogLevel.DEBUG)
+
+        Keep the most recent messages of the log in memory, without writing them to disk, and write them to the debug file only when an error is logged by the same mod or :func:`dump_flight_recorder` is called.
+
+        Messages are formatted only when they are written, so arguments that change after being logged are written as they are at that time.
+        The recorder does not enable the log, `enabled` and :func:`is_enabled` still only reflect the messages written to disk. Messages built only after checking them are not recorded while the log is disabled, pass a function returning the message or use :func:`debug_format` instead.
+
+        .. note:: Repeats of an error counted by :class:`.BBErrorAggregator` do not dump the recorders, only errors that are written do.
+
+        :Example usage:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            log.enable_flight_recorder(max_record_count=500)
+            # Recorded in memory, the log itself stays disabled.
+            log.debug('Something happened', sim=sim_info)
+            # Writes the error, followed by the messages recorded before it.
+            log.error('Something broke')
+
+        :param max_record_count: The number of messages kept, the oldest ones are discarded. Default is 1000.
+        :type max_record_count: int, optional
+        :param level: The lowest level of the messages to record. Default is DEBUG.
+        :type level: BBLogLevel, optional
+        """
+        if self._flight_recorder is None or self._flight_recorder.maxlen != max_record_count:
+            self._flight_recorder = deque(self._flight_recorder or (), maxlen=max_record_count)
+        self._flight_recorder_threshold = int(level)
+        logs = _flight_recorder_logs.setdefault(self.mod_name.lower(), list())
+        if self not in logs:
+            logs.append(self)
+        self._update_handled_threshold()
+
+    def disable_flight_recorder(self) -> None:
+        """disable_flight_recorder()
+
+        Stop recording messages in memory. The messages recorded so far are discarded.
+        """
+        self._flight_recorder = None
+        self._flight_recorder_threshold = _ERROR
+        logs = _flight_recorder_logs.get(self.mod_name.lower(), None)
+        if logs is not None and self in logs:
+            logs.remove(self)
+        self._update_handled_threshold()
+
+    def dump_flight_recorder(self, reason: str = 'being dumped') -> int:
+        """dump_flight_recorder(reason='being dumped')
+
+        Write the messages recorded by the flight recorder to the debug file and clear them.
+
+        :param reason: What caused the messages to be written, it completes the sentence "The last N messages recorded before ...". Default is 'being dumped'.
+        :type reason: str, optional
+        :return: The number of messages written.
+        :rtype: int
+        """
+        flight_recorder = self._flight_recorder
+        if not flight_recorder:
+            return 0
+        records = list(flight_recorder)
+        flight_recorder.clear()
+        # noinspection PyBroadException
+        try:
+            header = 'The last {} message(s) recorded before {}:'.format(len(records), reason)
+            lines = [self._format_line('FLIGHT_RECORDER', header, BBDateTimeUtils.get_current_real_date_time())]
+            for (record_time, message_type, message, args, fields) in records:
+                # noinspection PyBroadException
+                try:
+                    message = self._resolve_message(message, args)
+                except Exception as ex:
+                    message = '{} (failed to format: {})'.format(message, ex)
+                lines.append(self._format_line(message_type, message, datetime.fromtimestamp(record_time), fields=fields))
+            BBLogWriter().write(self._get_file_path(self._debug_file_name()), ''.join(lines), flush=True)
+        except Exception:
+            pass
+        return len(records)
+
     def debug(
         self,
-        message: str,
+        message: Union[str, Callable[[], str]],
         ignore_enabled: bool = False,
         **kwargs
     ):
@@ -61,18 +280,98 @@ class BBLog:
 
         Log a message.
 
-        :param message: The message to log.
-        :type message: str
+        :param message: The message to log or a function returning it. The function is only invoked when the message is logged.
+        :type message: Union[str, Callable[[], str]]
         :param ignore_enabled: If True, the message will be logged without checking if the log is enabled. If False, the message will only log when the log is enabled. Default is False.
         :type ignore_enabled: bool, optional
         :param kwargs: Keyword Arguments to format into the message.
         :type kwargs: Any
         """
-        if ignore_enabled or self.is_enabled():
-            if kwargs:
-                self._log_text('DEBUG', '{} {}'.format(message, pformat(kwargs)))
-            else:
-                self._log_text('DEBUG', message)
+        if ignore_enabled or self._handled_threshold <= _DEBUG:
+            self._handle_message('DEBUG', _DEBUG, message, kwargs, ignore_enabled=ignore_enabled)
+
+    def trace(
+        self,
+        message: Union[str, Callable[[], str]],
+        ignore_enabled: bool = False,
+        **kwargs
+    ):
+        """trace(message, ignore_enabled=False, **kwargs)
+
+        Log a message at the TRACE level.
+
+        :param message: The message to log or a function returning it. The function is only invoked when the message is logged.
+        :type message: Union[str, Callable[[], str]]
+        :param ignore_enabled: If True, the message will be logged regardless of the level of the log. Default is False.
+        :type ignore_enabled: bool, optional
+        :param kwargs: Keyword Arguments to format into the message.
+        :type kwargs: Any
+        """
+        if ignore_enabled or self._handled_threshold <= _TRACE:
+            self._handle_message('TRACE', _TRACE, message, kwargs, ignore_enabled=ignore_enabled)
+
+    def info(
+        self,
+        message: Union[str, Callable[[], str]],
+        ignore_enabled: bool = False,
+        **kwargs
+    ):
+        """info(message, ignore_enabled=False, **kwargs)
+
+        Log a message at the INFO level.
+
+        :param message: The message to log or a function returning it. The function is only invoked when the message is logged.
+        :type message: Union[str, Callable[[], str]]
+        :param ignore_enabled: If True, the message will be logged regardless of the level of the log. Default is False.
+        :type ignore_enabled: bool, optional
+        :param kwargs: Keyword Arguments to format into the message.
+        :type kwargs: Any
+        """
+        if ignore_enabled or self._handled_threshold <= _INFO:
+            self._handle_message('INFO', _INFO, message, kwargs, ignore_enabled=ignore_enabled)
+
+    def warn(
+        self,
+        message: Union[str, Callable[[], str]],
+        ignore_enabled: bool = False,
+        **kwargs
+    ):
+        """warn(message, ignore_enabled=False, **kwargs)
+
+        Log a message at the WARN level.
+
+        :param message: The message to log or a function returning it. The function is only invoked when the message is logged.
+        :type message: Union[str, Callable[[], str]]
+        :param ignore_enabled: If True, the message will be logged regardless of the level of the log. Default is False.
+        :type ignore_enabled: bool, optional
+        :param kwargs: Keyword Arguments to format into the message.
+        :type kwargs: Any
+        """
+        if ignore_enabled or self._handled_threshold <= _WARN:
+            self._handle_message('WARN', _WARN, message, kwargs, ignore_enabled=ignore_enabled)
+
+    def debug_format(
+        self,
+        format_text: str,
+        *args: Any,
+        ignore_enabled: bool = False,
+        **kwargs
+    ):
+        """debug_format(format_text, *args, ignore_enabled=False, **kwargs)
+
+        Log a message built from a format string. The message is only formatted when it is logged.
+
+        :param format_text: The text to format the arguments into, using str.format placeholders such as '{}'.
+        :type format_text: str
+        :param args: Arguments to format into the text.
+        :type args: Any
+        :param ignore_enabled: If True, the message will be logged without checking if the log is enabled. If False, the message will only log when the log is enabled. Default is False.
+        :type ignore_enabled: bool, optional
+        :param kwargs: Keyword Arguments to format into the message.
+        :type kwargs: Any
+        """
+        if ignore_enabled or self._handled_threshold <= _DEBUG:
+            self._handle_message('DEBUG', _DEBUG, format_text, kwargs, args=args, ignore_enabled=ignore_enabled)
 
     def error(
         self,
@@ -93,48 +392,55 @@ class BBLog:
         :type stack_trace: List[str], optional
         :param kwargs: Keyword Arguments to format into the error message.
         :type kwargs: Any
+
+        .. note:: When a stack trace is gathered, an error that keeps happening is only written the first time. Later occurrences are counted and written as a summary, see :class:`.BBErrorAggregator`.
         """
-        if kwargs:
-            self._log_error('{} {}'.format(message, pformat(kwargs)), exception=exception, stack_trace=stack_trace)
-        else:
-            self._log_error(message, exception=exception, stack_trace=stack_trace)
+        is_written = self._log_error(message, exception=exception, stack_trace=stack_trace, fields=kwargs)
+        # Repeats of an error are only counted, so an error repeating in a loop does not dump the recorders each time.
+        flight_recorder_logs = _flight_recorder_logs.get(self.mod_name.lower(), None) if is_written else None
+        if flight_recorder_logs:
+            for flight_recorder_log in tuple(flight_recorder_logs):
+                flight_recorder_log.dump_flight_recorder(reason='an error in [{}]'.format(self.name))
 
     def log_stack(self) -> None:
         """log_stack()
 
-        Log the current stack trace and the calling frames
+        Log the current stack trace and the calling frames, when the log is enabled at any level.
 
         """
-        if not self.is_enabled():
+        if not self.enabled:
             return
         import inspect
         current_frame = inspect.currentframe()
         calling_frame = inspect.getouterframes(current_frame, 2)
-        self.debug('StackTrace', stack_trace=calling_frame)
+        self.debug('StackTrace', ignore_enabled=True, stack_trace=calling_frame)
 
-    def enable(self) -> None:
-        """enable()
+    def enable(self, level: BBLogLevel = BBLogLevel.DEBUG) -> None:
+        """enable(level=BBLogLevel.DEBUG)
 
         Enable the log.
+
+        :param level: The lowest level of the messages to write. Default is DEBUG.
+        :type level: BBLogLevel, optional
         """
-        self._is_enabled = True
+        self.set_level(level)
 
     def disable(self) -> None:
         """disable()
 
-        Disable the log.
+        Disable the log. Errors are still written.
         """
-        self._is_enabled = False
+        self.set_level(BBLogLevel.ERROR)
 
     def is_enabled(self) -> bool:
         """is_enabled()
 
-        Determine if the log is enabled.
+        Determine if the log is enabled, meaning it writes messages of some level below ERROR. Use :func:`is_level_enabled` or :attr:`level` to check which ones.
 
         :return: True, if the log is enabled. False, if not.
         :rtype: bool
         """
-        return self._is_enabled
+        return self.enabled
 
     def __logging_file_path(self) -> str:
         from bluuberrylibrary.utils.file.bb_game_file_utils import BBGameFileUtils
@@ -142,34 +448,101 @@ class BBLog:
             return os.path.join(BBGameFileUtils.get_the_sims_4_file_path(), 'bb_logs', self._logging_file_path)
         return os.path.join(BBGameFileUtils.get_the_sims_4_file_path(), 'bb_logs')
 
+    def _get_file_path(self, file_name: str) -> str:
+        file_path = self._file_paths.get(file_name, None)
+        if file_path is None:
+            file_path = os.path.join(self.__logging_file_path(), file_name)
+            self._file_paths[file_name] = file_path
+            if self._rotation is not None:
+                BBLogWriter().set_rotation(file_path, **self._rotation)
+        return file_path
+
+    def _file_extension(self) -> str:
+        if self._output_format == BBLogOutputFormat.JSON_LINES:
+            return 'jsonl'
+        return 'txt'
+
     def _debug_file_name(self) -> str:
-        return '{}_{}_Debug.txt'.format(self.mod_name, self._mod_identity.mod_version)
+        return '{}_{}_Debug.{}'.format(self.mod_name, self._mod_identity.mod_version, self._file_extension())
 
     def _error_file_name(self) -> str:
-        return '{}_{}_Exceptions.txt'.format(self.mod_name, self._mod_identity.mod_version)
+        return '{}_{}_Exceptions.{}'.format(self.mod_name, self._mod_identity.mod_version, self._file_extension())
 
-    def _log_text(self, message_type: str, message: str, file_name: str = None):
-        current_date_time_str = BBDateTimeUtils.get_current_real_date_time_string()
-        new_message = '{} {}: [{}]: {}\n'.format(current_date_time_str, message_type, self.name, message)
+    def _update_handled_threshold(self) -> None:
+        self._handled_threshold = min(self._level_threshold, self._flight_recorder_threshold)
+        self.enabled = self._level_threshold < _ERROR
+
+    @staticmethod
+    def _resolve_message(message: Any, args: Union[Tuple[Any, ...], None]) -> Any:
+        if args is not None:
+            return message.format(*args)
+        if callable(message):
+            return message()
+        return message
+
+    def _handle_message(self, message_type: str, level_threshold: int, message: Any, fields: Dict[str, Any], args: Tuple[Any, ...] = None, ignore_enabled: bool = False):
+        if self._flight_recorder_threshold <= level_threshold and self._flight_recorder is not None:
+            self._flight_recorder.append((time.time(), message_type, message, args, fields))
+        if ignore_enabled or self._level_threshold <= level_threshold:
+            self._log_text(message_type, self._resolve_message(message, args), fields=fields)
+
+    def _format_line(self, message_type: str, message: str, date_time: datetime, fields: Dict[str, Any] = None) -> str:
+        if self._output_format == BBLogOutputFormat.JSON_LINES:
+            return self._format_json_line(message_type, message, fields=fields, date_time=date_time)
+        if fields:
+            message = '{} {}'.format(message, pformat(fields))
+        return '{} {}: [{}]: {}\n'.format(date_time.strftime('%Y-%m-%d %H:%M:%S.%f'), message_type, self.name, message)
+
+    def _format_json_line(self, message_type: str, message: str, fields: Dict[str, Any] = None, date_time: datetime = None, **extra_fields) -> str:
+        record = {
+            'timestamp': (date_time or BBDateTimeUtils.get_current_real_date_time()).isoformat(),
+            'level': message_type,
+            'log': self.name,
+            'mod': self.mod_name,
+            'message': str(message)
+        }
+        record.update(extra_fields)
+        if fields:
+            record['fields'] = fields
+        # Values that are not JSON types, such as Sims or objects, are written as their string representation.
+        return json.dumps(record, default=str) + '\n'
+
+    def _log_text(self, message_type: str, message: str, file_name: str = None, fields: Dict[str, Any] = None):
         # noinspection PyBroadException
         try:
-            file_path = os.path.join(self.__logging_file_path(), file_name or self._debug_file_name())
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            BBFileUtils.write_file(file_path, new_message, ignore_errors=True)
+            new_message = self._format_line(message_type, message, BBDateTimeUtils.get_current_real_date_time(), fields=fields)
+            file_path = self._get_file_path(file_name or self._debug_file_name())
+            BBLogWriter().write(file_path, new_message)
         except Exception:
             pass
 
-    def _log_error(self, message: str, file_name: str = None, exception: Exception = None, stack_trace: List[str] = None):
+    def _log_error(self, message: str, file_name: str = None, exception: Exception = None, stack_trace: List[str] = None, fields: Dict[str, Any] = None) -> bool:
         # noinspection PyBroadException
         try:
-            exceptions = stack_trace or BBStacktraceUtils.get_full_stack_trace()
-            if exception is not None:
-                stack_trace_message = '{}{} -> {}: {}\n'.format(''.join(exceptions), message, type(exception).__name__, exception)
+            file_path = self._get_file_path(file_name or self._error_file_name())
+            if stack_trace:
+                exceptions = stack_trace
+            else:
+                # Skip this function and the public function that called it.
+                captured_stack = BBStacktraceUtils.capture_stack(skip_frames=2, exception=exception)
+                exception_type = type(exception) if exception is not None else None
+                json_lines = self._output_format == BBLogOutputFormat.JSON_LINES
+                if not BBErrorAggregator().add_error(file_path, self.mod_name, self.name, message, captured_stack, exception_type=exception_type, json_lines=json_lines):
+                    return False
+                exceptions = captured_stack.format()
+            if self._output_format == BBLogOutputFormat.JSON_LINES:
+                exception_text = None if exception is None else '{}: {}'.format(type(exception).__name__, exception)
+                exception_traceback_text = self._format_json_line('ERROR', message, fields=fields, exception=exception_text, stack_trace=''.join(exceptions))
             else:
-                stack_trace_message = '{}{}\n'.format(''.join(exceptions), message)
-            file_path = os.path.join(self.__logging_file_path(), file_name or self._error_file_name())
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            exception_traceback_text = '[{}] {} {}\n'.format(self.mod_name, BBDateTimeUtils.get_current_real_date_time_string(), stack_trace_message)
-            BBFileUtils.write_file(file_path, exception_traceback_text, ignore_errors=True)
+                if fields:
+                    message = '{} {}'.format(message, pformat(fields))
+                if exception is not None:
+                    stack_trace_message = '{}{} -> {}: {}\n'.format(''.join(exceptions), message, type(exception).__name__, exception)
+                else:
+                    stack_trace_message = '{}{}\n'.format(''.join(exceptions), message)
+                exception_traceback_text = '[{}] {} {}\n'.format(self.mod_name, BBDateTimeUtils.get_current_real_date_time_string(), stack_trace_message)
+            # Errors are written immediately, so they are on disk even if the game crashes right after.
+            BBLogWriter().write(file_path, exception_traceback_text, flush=True)
+            return True
         except Exception:
-            pass
+            return False
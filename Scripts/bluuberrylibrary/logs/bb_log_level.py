@@ -0,0 +1,26 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+from bluuberrylibrary.enums.classes.bb_int import BBInt
+
+
+class BBLogLevel(BBInt):
+    """Levels of log messages, the least severe first.
+
+    A log writes the messages at or above its level. Errors are always written.
+
+    - TRACE: Very detailed messages, such as every step of a calculation.
+    - DEBUG: Messages useful when diagnosing a problem. Enabling a log without a level writes messages from this level up.
+    - INFO: Messages about notable things happening.
+    - WARN: Messages about something unexpected that was handled.
+    - ERROR: Errors. A disabled log still writes these.
+    """
+    TRACE: 'BBLogLevel' = 10
+    DEBUG: 'BBLogLevel' = 20
+    INFO: 'BBLogLevel' = 30
+    WARN: 'BBLogLevel' = 40
+    ERROR: 'BBLogLevel' = 50
@@ -0,0 +1,18 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+from bluuberrylibrary.enums.classes.bb_int import BBInt
+
+
+class BBLogOutputFormat(BBInt):
+    """Formats in which logs write their messages.
+
+    - TEXT: One line of free-form text per message, written to "modname_version_Debug.txt" and "modname_version_Exceptions.txt".
+    - JSON_LINES: One JSON object per line with the timestamp, level, log name, mod name, message and keyword arguments of the message as fields, written to "modname_version_Debug.jsonl" and "modname_version_Exceptions.jsonl".
+    """
+    TEXT: 'BBLogOutputFormat' = ...
+    JSON_LINES: 'BBLogOutputFormat' = ...
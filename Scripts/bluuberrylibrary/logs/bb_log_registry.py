@@ -6,9 +6,11 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 Copyright (c) BLUUBERRYBONANZA
 """
 import os
-from typing import Dict
+from fnmatch import fnmatchcase
+from typing import Dict, List, Tuple, Union
 
 from bluuberrylibrary.logs.bb_log import BBLog
+from bluuberrylibrary.logs.bb_log_level import BBLogLevel
 from bluuberrylibrary.mod_identity import ModIdentity
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
 from bluuberrylibrary.classes.bb_singleton import BBSingleton
@@ -37,6 +39,15 @@ class BBLogRegistry(metaclass=BBSingleton):
 
         # The BluuberryLibrary_v1.0_Debug.txt file will contain the "This is dummy text." message.
 
+    Log names may contain the wildcards of :func:`fnmatch.fnmatch` and may be prefixed with the name of their mod, such as "modname.*".
+    A log name with wildcards also applies to logs registered later, so the logs of a mod can be enabled before the mod creates them.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        # Write warnings and errors of every log of a mod.
+        BBLogRegistry().enable_logs('modname.*', level=BBLogLevel.WARN)
+
     .. note::
 
         Available Commands:
@@ -49,6 +60,8 @@ class BBLogRegistry(metaclass=BBSingleton):
     """
     def __init__(self) -> None:
         self._registered_logs: Dict[str, Dict[str, BBLog]] = dict()
+        # The levels set through log names with wildcards, by lower case mod name (or None for any mod) and lower case pattern, the most recent last.
+        self._log_level_patterns: Dict[Tuple[Union[str, None], str], BBLogLevel] = dict()
         self._delete_old_log_files()
 
     @classmethod
@@ -72,26 +85,31 @@ class BBLogRegistry(metaclass=BBSingleton):
                 continue
 
     # noinspection PyUnusedLocal
-    def enable_logs(self, log_name: str, mod_identity: BBModIdentity = None) -> bool:
-        """enable_logs(log_name, mod_identity=None)
+    def enable_logs(self, log_name: str, mod_identity: BBModIdentity = None, level: BBLogLevel = BBLogLevel.DEBUG) -> bool:
+        """enable_logs(log_name, mod_identity=None, level=BBLogLevel.DEBUG)
 
         Enable all logs with the specified name. If a mod identity is specified, only logs registered to that mod will be enabled. Otherwise, all logs with the same name will be enabled.
 
-        :param log_name: The name of the logs to enable.
+        :param log_name: The name of the logs to enable. It may contain wildcards and be prefixed with the name of the mod, such as 'modname.*', in which case logs registered later are enabled as well.
         :type log_name: str
         :param mod_identity: The identity of the mod the log belongs to. Default is None.
         :type mod_identity: BBModIdentity, optional
+        :param level: The lowest level of the messages the logs write. Default is DEBUG.
+        :type level: BBLogLevel, optional
         :return: True, if successful. False, if not.
         :rtype: bool
         """
         if self._registered_logs is None:
             self._registered_logs = dict()
+        if self._is_log_name_pattern(log_name):
+            self._set_log_level_pattern(log_name, level, mod_identity=mod_identity)
+            return True
         if mod_identity is None:
             for log_mod_name in self._registered_logs:
                 if log_name not in self._registered_logs[log_mod_name]:
                     continue
                 log = self._registered_logs[log_mod_name][log_name]
-                log.enable()
+                log.enable(level=level)
         else:
             mod_name = mod_identity.mod_name.lower()
             if mod_name not in self._registered_logs:
@@ -99,10 +117,10 @@ class BBLogRegistry(metaclass=BBSingleton):
             if log_name not in self._registered_logs[mod_name]:
                 log = self.register_log(mod_identity, log_name)
                 if log is not None:
-                    log.enable()
+                    log.enable(level=level)
                     return True
                 return False
-            self._registered_logs[mod_name][log_name].enable()
+            self._registered_logs[mod_name][log_name].enable(level=level)
         return True
 
     # noinspection PyUnusedLocal
@@ -111,7 +129,7 @@ class BBLogRegistry(metaclass=BBSingleton):
 
         Disable all logs with the specified name. If a mod identity is specified, only logs registered to that mod will be disabled. Otherwise, all logs with the same name will be disabled.
 
-        :param log_name: The name of the logs to disable.
+        :param log_name: The name of the logs to disable. It may contain wildcards and be prefixed with the name of the mod, such as 'modname.*', in which case logs registered later are disabled as well.
         :type log_name: str
         :param mod_identity: The identity of the mod the log belongs to. Default is None.
         :type mod_identity: BBModIdentity, optional
@@ -120,6 +138,9 @@ class BBLogRegistry(metaclass=BBSingleton):
         """
         if self._registered_logs is None:
             self._registered_logs = dict()
+        if self._is_log_name_pattern(log_name):
+            self._set_log_level_pattern(log_name, BBLogLevel.ERROR, mod_identity=mod_identity)
+            return True
         if mod_identity is None:
             for log_mod_name in self._registered_logs:
                 if log_name not in self._registered_logs[log_mod_name]:
@@ -135,6 +156,59 @@ class BBLogRegistry(metaclass=BBSingleton):
             self._registered_logs[mod_name][log_name].disable()
         return True
 
+    def set_mod_level(self, mod_identity: BBModIdentity, level: BBLogLevel) -> None:
+        """set_mod_level(mod_identity, level)
+
+        Change the level of every log of a mod, including logs the mod registers later.
+
+        :param mod_identity: The identity of the mod.
+        :type mod_identity: BBModIdentity
+        :param level: The lowest level of the messages the logs write. ERROR disables the logs.
+        :type level: BBLogLevel
+        """
+        self._set_log_level_pattern('*', level, mod_identity=mod_identity)
+
+    def get_logs(self, log_name: str = '*') -> List[BBLog]:
+        """get_logs(log_name='*')
+
+        Retrieve the registered logs matching a name.
+
+        :param log_name: The name of the logs. It may contain wildcards and be prefixed with the name of the mod, such as 'modname.*'. Default is all logs.
+        :type log_name: str, optional
+        :return: The matching logs.
+        :rtype: List[BBLog]
+        """
+        pattern = log_name.lower()
+        return [log for logs in self._registered_logs.values() for log in logs.values() if self._log_matches(log, None, pattern)]
+
+    @staticmethod
+    def _is_log_name_pattern(log_name: str) -> bool:
+        return any(character in log_name for character in '*?[')
+
+    @staticmethod
+    def _log_matches(log: BBLog, mod_name: Union[str, None], pattern: str) -> bool:
+        log_mod_name = log.mod_name.lower()
+        if mod_name is not None and log_mod_name != mod_name:
+            return False
+        log_name = log.name.lower()
+        return fnmatchcase(log_name, pattern) or fnmatchcase('{}.{}'.format(log_mod_name, log_name), pattern)
+
+    def _set_log_level_pattern(self, log_name: str, level: BBLogLevel, mod_identity: BBModIdentity = None) -> None:
+        key = (None if mod_identity is None else mod_identity.mod_name.lower(), log_name.lower())
+        # Re-inserted, so it takes precedence over the patterns set before it.
+        self._log_level_patterns.pop(key, None)
+        self._log_level_patterns[key] = level
+        (mod_name, pattern) = key
+        for logs in self._registered_logs.values():
+            for log in logs.values():
+                if self._log_matches(log, mod_name, pattern):
+                    log.set_level(level)
+
+    def _apply_log_level_patterns(self, log: BBLog) -> None:
+        for ((mod_name, pattern), level) in self._log_level_patterns.items():
+            if self._log_matches(log, mod_name, pattern):
+                log.set_level(level)
+
     def register_log(
         self,
         mod_identity: BBModIdentity,
@@ -169,6 +243,8 @@ class BBLogRegistry(metaclass=BBSingleton):
             return self._registered_logs[mod_name][log_name]
         log = BBLog(mod_identity, log_name, logging_file_path=override_logging_path)
         self._registered_logs[mod_name][log_name] = log
+        if self._log_level_patterns:
+            self._apply_log_level_patterns(log)
         if first_time_log and mod_identity is not None and _bb_base_log is not None:
             _bb_base_log.enable()
             _bb_base_log.debug(f'{mod_identity} Detected.')
@@ -0,0 +1,360 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import atexit
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, IO, List, Tuple
+
+from bluuberrylibrary.classes.bb_singleton import BBSingleton
+
+
+class _BBLogRotation:
+    # The rotation settings of a file, along with the segments it was rotated into, the oldest first.
+    def __init__(self, max_file_size: int, max_rotated_file_count: int, compress_rotated_files: bool):
+        self.max_file_size = max_file_size
+        self.max_rotated_file_count = max_rotated_file_count
+        self.compress_rotated_files = compress_rotated_files
+        self.rotated_file_paths: Deque[str] = deque()
+        self.rotation_count = 0
+
+    def load_rotated_file_paths(self, file_path: str) -> None:
+        # Continue the numbering of the segments left by a previous session, so they are neither overwritten nor kept forever.
+        (file_root, file_extension) = os.path.splitext(file_path)
+        rotated_file_name_pattern = re.compile(r'{}\.(\d+){}(\.gz)?$'.format(re.escape(os.path.basename(file_root)), re.escape(file_extension)))
+        # noinspection PyBroadException
+        try:
+            file_names = os.listdir(os.path.dirname(file_path))
+        except Exception:
+            return
+        rotated_files = list()
+        for file_name in file_names:
+            match = rotated_file_name_pattern.match(file_name)
+            if match is not None:
+                rotated_files.append((int(match.group(1)), file_name))
+        rotated_files.sort()
+        self.rotated_file_paths = deque(os.path.join(os.path.dirname(file_path), file_name) for (_, file_name) in rotated_files)
+        if rotated_files:
+            self.rotation_count = max(self.rotation_count, rotated_files[-1][0])
+
+
+def _compress_file(file_path: str, compressed_file_path: str) -> None:
+    # noinspection PyBroadException
+    try:
+        import gzip
+        import shutil
+        with open(file_path, mode='rb') as source_file, gzip.open(compressed_file_path, mode='wb') as compressed_file:
+            shutil.copyfileobj(source_file, compressed_file)
+        os.remove(file_path)
+    except Exception:
+        pass
+
+
+class BBLogWriter(metaclass=BBSingleton):
+    """BBLogWriter(max_queued_lines=50000, flush_size=65536, flush_interval_seconds=1.0, clock=time.monotonic, write_in_background=True)
+
+    Writes the text of logs to their files in batches.
+
+    Text is queued in memory and written whenever the queued text reaches `flush_size` characters, `flush_interval_seconds` pass since the last write or :func:`flush` is called.
+    Files stay open between writes, so a log does not open and close its file for every message.
+
+    Queued text is written by a background thread, started the first time text is written, so the game thread never waits for the disk.
+    Only text written with `flush=True`, such as errors, and calls to :func:`flush` and :func:`close` write on the calling thread.
+
+    .. note:: Queued text is written when the zone unloads and when the game exits.
+
+    Files can be rotated once they reach a size, see :func:`set_rotation`. Rotating renames the file and starts a new one, compressing the old one happens on a separate thread, so writing is never held up by it.
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        BBLogWriter().write(file_path, 'Some text\\n')
+        # Write errors immediately, so they are on disk even if the game crashes right after.
+        BBLogWriter().write(file_path, 'Some error\\n', flush=True)
+
+    :param max_queued_lines: The maximum number of lines queued at once. Lines written while the queue is full are dropped and counted. Default is 50000.
+    :type max_queued_lines: int, optional
+    :param flush_size: The number of queued characters that causes the queue to be written. Default is 65536.
+    :type flush_size: int, optional
+    :param flush_interval_seconds: The number of seconds after which queued text is written. Default is 1.0.
+    :type flush_interval_seconds: float, optional
+    :param clock: A function returning the current time in seconds. Default is time.monotonic.
+    :type clock: Callable[[], float], optional
+    :param write_in_background: If True, the background thread is started the first time text is written. If False, queued text is written by the callers of :func:`write` until :func:`start_background_thread` is called. Default is True.
+    :type write_in_background: bool, optional
+    """
+    def __init__(self, max_queued_lines: int = 50000, flush_size: int = 65536, flush_interval_seconds: float = 1.0, clock: Callable[[], float] = time.monotonic, write_in_background: bool = True):
+        self._max_queued_lines = max_queued_lines
+        self._flush_size = flush_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._clock = clock
+        self._queue: Deque[Tuple[str, str]] = deque()
+        self._queued_size = 0
+        self._last_flush_time = clock()
+        # Lines dropped since they were last reported, by file path.
+        self._dropped_line_counts: Counter = Counter()
+        self._total_dropped_line_count = 0
+        self._open_files: Dict[str, IO[str]] = dict()
+        self._rotations: Dict[str, _BBLogRotation] = dict()
+        # The queue lock is only held while queueing or taking lines, so writers never wait for the disk.
+        self._queue_lock = threading.Lock()
+        self._file_lock = threading.RLock()
+        self._write_in_background = write_in_background
+        self._background_thread: threading.Thread = None
+        self._background_thread_lock = threading.Lock()
+        # Set to wake the background thread early, when enough text is queued or the thread is stopping.
+        self._background_thread_wake_event = threading.Event()
+        self._is_background_thread_stopping = False
+        atexit.register(self.close)
+
+    @property
+    def queued_line_count(self) -> int:
+        """The number of lines waiting to be written."""
+        return len(self._queue)
+
+    @property
+    def total_dropped_line_count(self) -> int:
+        """The number of lines dropped because the queue was full."""
+        return self._total_dropped_line_count
+
+    @property
+    def is_running_in_background(self) -> bool:
+        """True, if queued text is written by a background thread. False, if it is written by the callers of :func:`write`."""
+        return self._background_thread is not None and self._background_thread.is_alive()
+
+    def write(self, file_path: str, text: str, flush: bool = False) -> bool:
+        """write(file_path, text, flush=False)
+
+        Queue text to be appended to a file.
+
+        :param file_path: The file to append to.
+        :type file_path: str
+        :param text: The text to append.
+        :type text: str
+        :param flush: If True, the queue is written before returning. Default is False.
+        :type flush: bool, optional
+        :return: True, if the text was queued. False, if it was dropped because the queue is full.
+        :rtype: bool
+        """
+        if self._write_in_background and self._background_thread is None:
+            self.start_background_thread()
+        with self._queue_lock:
+            if len(self._queue) >= self._max_queued_lines:
+                self._dropped_line_counts[file_path] += 1
+                self._total_dropped_line_count += 1
+                queued = False
+            else:
+                self._queue.append((file_path, text))
+                self._queued_size += len(text)
+                queued = True
+            is_full = self._queued_size >= self._flush_size
+        if flush:
+            self.flush()
+        elif self.is_running_in_background:
+            if is_full:
+                self._background_thread_wake_event.set()
+        elif is_full or self._clock() - self._last_flush_time >= self._flush_interval_seconds:
+            self.flush()
+        return queued
+
+    def flush(self) -> None:
+        """flush()
+
+        Write all queued text to its files.
+        """
+        # Held while taking the queue, so text taken by one flush is never written after text taken by a later one.
+        with self._file_lock:
+            with self._queue_lock:
+                queue = self._queue
+                dropped_line_counts = self._dropped_line_counts
+                self._queue = deque()
+                self._queued_size = 0
+                self._dropped_line_counts = Counter()
+                self._last_flush_time = self._clock()
+            if not queue and not dropped_line_counts:
+                return
+            self._write_queue(queue, dropped_line_counts)
+
+    def _write_queue(self, queue: Deque[Tuple[str, str]], dropped_line_counts: Counter) -> None:
+        texts_by_file_path: Dict[str, List[str]] = dict()
+        for (file_path, text) in queue:
+            texts = texts_by_file_path.get(file_path, None)
+            if texts is None:
+                texts = list()
+                texts_by_file_path[file_path] = texts
+            texts.append(text)
+        for (file_path, dropped_line_count) in dropped_line_counts.items():
+            texts_by_file_path.setdefault(file_path, list()).append('[{} line(s) were dropped because too many were written at once]\n'.format(dropped_line_count))
+        for (file_path, texts) in texts_by_file_path.items():
+            # noinspection PyBroadException
+            try:
+                opened_file = self._get_open_file(file_path)
+                opened_file.write(''.join(texts))
+                opened_file.flush()
+                rotation = self._rotations.get(file_path, None)
+                if rotation is not None and opened_file.tell() >= rotation.max_file_size:
+                    self._rotate_file(file_path, rotation)
+            except Exception:
+                self._close_file(file_path)
+
+    def _rotate_file(self, file_path: str, rotation: _BBLogRotation) -> None:
+        self._close_file(file_path)
+        rotation.rotation_count += 1
+        (file_root, file_extension) = os.path.splitext(file_path)
+        rotated_file_path = '{}.{}{}'.format(file_root, rotation.rotation_count, file_extension)
+        os.replace(file_path, rotated_file_path)
+        if rotation.compress_rotated_files:
+            compressed_file_path = rotated_file_path + '.gz'
+            threading.Thread(target=_compress_file, args=(rotated_file_path, compressed_file_path), name='BBLogWriterCompression', daemon=True).start()
+            rotation.rotated_file_paths.append(compressed_file_path)
+        else:
+            rotation.rotated_file_paths.append(rotated_file_path)
+        while len(rotation.rotated_file_paths) > max(0, rotation.max_rotated_file_count):
+            oldest_file_path = rotation.rotated_file_paths.popleft()
+            # noinspection PyBroadException
+            try:
+                os.remove(oldest_file_path)
+            except Exception:
+                pass
+
+    def set_rotation(self, file_path: str, max_file_size: int, max_rotated_file_count: int = 5, compress_rotated_files: bool = False) -> None:
+        """set_rotation(file_path, max_file_size, max_rotated_file_count=5, compress_rotated_files=False)
+
+        Rotate a file once it reaches a size. The file is renamed to "name.1.ext", "name.2.ext" and so on and written to anew.
+
+        Numbering continues after the rotated files already next to the file, which count towards `max_rotated_file_count`.
+
+        .. note:: The size is checked after each batch of text is written, so a file may exceed `max_file_size` by up to one batch, see `flush_size`.
+
+        :param file_path: The file to rotate.
+        :type file_path: str
+        :param max_file_size: The size in bytes a file is rotated at.
+        :type max_file_size: int
+        :param max_rotated_file_count: The number of rotated files kept, the oldest ones are deleted. Default is 5.
+        :type max_rotated_file_count: int, optional
+        :param compress_rotated_files: If True, rotated files are compressed with gzip on a separate thread, adding ".gz" to their name. Default is False.
+        :type compress_rotated_files: bool, optional
+        """
+        with self._file_lock:
+            rotation = self._rotations.get(file_path, None)
+            if rotation is None:
+                rotation = _BBLogRotation(max_file_size, max_rotated_file_count, compress_rotated_files)
+                rotation.load_rotated_file_paths(file_path)
+                self._rotations[file_path] = rotation
+                return
+            rotation.max_file_size = max_file_size
+            rotation.max_rotated_file_count = max_rotated_file_count
+            rotation.compress_rotated_files = compress_rotated_files
+
+    def remove_rotation(self, file_path: str) -> None:
+        """remove_rotation(file_path)
+
+        Stop rotating a file.
+
+        :param file_path: The file to stop rotating.
+        :type file_path: str
+        """
+        with self._file_lock:
+            self._rotations.pop(file_path, None)
+
+    def close_file(self, file_path: str) -> None:
+        """close_file(file_path)
+
+        Write the queued text and close a file, so it can be moved or deleted. It is opened again when more text is written to it.
+
+        :param file_path: The file to close.
+        :type file_path: str
+        """
+        self.flush()
+        with self._file_lock:
+            self._close_file(file_path)
+
+    def close(self) -> None:
+        """close()
+
+        Write the queued text, stop the background thread and close all files.
+        """
+        self.stop_background_thread()
+        self.flush()
+        with self._file_lock:
+            for file_path in tuple(self._open_files.keys()):
+                self._close_file(file_path)
+
+    def start_background_thread(self) -> None:
+        """start_background_thread()
+
+        Write queued text from a background thread every `flush_interval_seconds` or as soon as `flush_size` characters are queued, instead of from the callers of :func:`write`.
+
+        .. note:: This is done automatically the first time text is written, unless the writer was created with `write_in_background` set to False.
+        """
+        with self._background_thread_lock:
+            if self.is_running_in_background:
+                return
+            self._write_in_background = True
+            self._is_background_thread_stopping = False
+            self._background_thread_wake_event.clear()
+            background_thread = threading.Thread(target=self._run_background_thread, name='BBLogWriter', daemon=True)
+            # noinspection PyBroadException
+            try:
+                background_thread.start()
+            except Exception:
+                # Without a thread, queued text is written by the callers of write.
+                self._write_in_background = False
+                return
+            self._background_thread = background_thread
+
+    def stop_background_thread(self) -> None:
+        """stop_background_thread()
+
+        Stop writing queued text from a background thread. Queued text is written by the callers of :func:`write` from then on.
+        """
+        with self._background_thread_lock:
+            # Not started again by later writes, such as those made while the game exits.
+            self._write_in_background = False
+            background_thread = self._background_thread
+            if background_thread is None:
+                return
+            self._is_background_thread_stopping = True
+            self._background_thread_wake_event.set()
+            self._background_thread = None
+        if background_thread is not threading.current_thread():
+            background_thread.join()
+
+    def _run_background_thread(self) -> None:
+        while True:
+            self._background_thread_wake_event.wait(self._flush_interval_seconds)
+            self._background_thread_wake_event.clear()
+            if self._is_background_thread_stopping:
+                return
+            # noinspection PyBroadException
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def _get_open_file(self, file_path: str) -> IO[str]:
+        opened_file = self._open_files.get(file_path, None)
+        if opened_file is None:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            opened_file = open(file_path, mode='a', encoding='utf-8')
+            self._open_files[file_path] = opened_file
+        return opened_file
+
+    def _close_file(self, file_path: str) -> None:
+        opened_file = self._open_files.pop(file_path, None)
+        if opened_file is None:
+            return
+        # noinspection PyBroadException
+        try:
+            opened_file.close()
+        except Exception:
+            pass
@@ -5,15 +5,70 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) BLUUBERRYBONANZA
 """
+import linecache
 import sys
 import traceback
 from collections import namedtuple
-from typing import Any, List
+from types import CodeType
+from typing import Any, List, Tuple, Type, Union
 
 # The following was tweaked slightly from the publicly made available, copyright free code here: https://stackoverflow.com/questions/13210436/get-full-traceback
 FullTraceback = namedtuple('FullTraceback', ('tb_frame', 'tb_lineno', 'tb_next'))
 
 
+class BBCapturedStack:
+    """BBCapturedStack(frames, exception_type=None, exception_value=None)
+
+    A stack captured by :func:`~BBStacktraceUtils.capture_stack`.
+
+    Only the code and line number of each frame are kept. The stack is formatted the first time its lines are requested, reading the source lines through :mod:`linecache`.
+
+    :param frames: The code and line number of each frame, the outermost first.
+    :type frames: Tuple[Tuple[CodeType, int], ...]
+    :param exception_type: The type of the exception being handled. Default is None.
+    :type exception_type: Type[BaseException], optional
+    :param exception_value: The exception being handled. Default is None.
+    :type exception_value: BaseException, optional
+    """
+    def __init__(self, frames: Tuple[Tuple[CodeType, int], ...], exception_type: Type[BaseException] = None, exception_value: BaseException = None):
+        self._frames = frames
+        self._exception_type = exception_type
+        self._exception_value = exception_value
+        self._lines: Union[List[str], None] = None
+
+    @property
+    def frames(self) -> Tuple[Tuple[CodeType, int], ...]:
+        """The code and line number of each frame, the outermost first."""
+        return self._frames
+
+    @property
+    def exception_type(self) -> Union[Type[BaseException], None]:
+        """The type of the exception being handled when the stack was captured, or None if there was none."""
+        return self._exception_type
+
+    def format(self) -> List[str]:
+        """format()
+
+        Format the stack the way :func:`traceback.format_exception` does.
+
+        :return: A list of stack trace lines.
+        :rtype: List[str]
+        """
+        if self._lines is not None:
+            return self._lines
+        lines = ['Traceback (most recent call last):\n']
+        for (code, line_number) in self._frames:
+            lines.append('  File "{}", line {}, in {}\n'.format(code.co_filename, line_number, code.co_name))
+            # Source files are read once and kept by linecache. Scripts only available as compiled files have no source lines.
+            source_line = linecache.getline(code.co_filename, line_number).strip()
+            if source_line:
+                lines.append('    {}\n'.format(source_line))
+        if self._exception_type is not None:
+            lines.extend(traceback.format_exception_only(self._exception_type, self._exception_value))
+        self._lines = lines
+        return lines
+
+
 class BBStacktraceUtils:
     """Utilities for accessing the stack trace of your mod.
 
@@ -42,6 +97,45 @@ class BBStacktraceUtils:
             cur_frame = cur_frame.f_back
         return stack_trace
 
+    @classmethod
+    def capture_stack(cls, skip_frames: int = 1, max_depth: int = 32, exception: BaseException = None) -> BBCapturedStack:
+        """capture_stack(skip_frames=1, max_depth=32, exception=None)
+
+        Capture the current stack, along with the traceback of the exception being handled. Capturing is cheap, as formatting is deferred until :func:`~BBCapturedStack.format` is called.
+
+        :param skip_frames: The number of frames to skip, not counting this function. Default is 1, skipping the caller.
+        :type skip_frames: int, optional
+        :param max_depth: The maximum number of frames kept from the current stack and from the traceback of the exception each, the innermost ones. Default is 32.
+        :type max_depth: int, optional
+        :param exception: The exception whose traceback is captured. If not specified, the exception currently being handled is used, if any. Default is None.
+        :type exception: BaseException, optional
+        :return: The captured stack.
+        :rtype: BBCapturedStack
+        """
+        if exception is not None:
+            exception_type = type(exception)
+            exception_traceback = exception.__traceback__
+        else:
+            (exception_type, exception, exception_traceback) = sys.exc_info()
+        # The frame handling the exception is the first frame of its traceback, which has the line that raised.
+        exception_frame = exception_traceback.tb_frame if exception_traceback is not None else None
+        frames = list()
+        try:
+            frame = sys._getframe(skip_frames + 1)
+        except ValueError:
+            frame = None
+        while frame is not None and len(frames) < max_depth:
+            if frame is not exception_frame:
+                frames.append((frame.f_code, frame.f_lineno))
+            frame = frame.f_back
+        frames.reverse()
+        traceback_frames = list()
+        while exception_traceback is not None:
+            traceback_frames.append((exception_traceback.tb_frame.f_code, exception_traceback.tb_lineno))
+            exception_traceback = exception_traceback.tb_next
+        frames.extend(traceback_frames[-max_depth:])
+        return BBCapturedStack(tuple(frames), exception_type=exception_type, exception_value=exception)
+
     @classmethod
     def get_full_stack_trace(cls, skip_lines: int = 1) -> List[str]:
         """Retrieve the full stacktrace from the current stack.
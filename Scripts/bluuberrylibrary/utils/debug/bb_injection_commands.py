@@ -0,0 +1,107 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import os
+
+from bluuberrylibrary.mod_identity import ModIdentity
+from sims4.commands import Command, CommandType
+
+
+@Command(
+    'bbl.injections',
+    # 'List the functions injected by mods. Specify a mod name to only list the injections of that mod. The list is also written to "The Sims 4/bb_logs/BluuberryLibrary_version_Debug.txt"',
+    command_type=CommandType.Live
+)
+def _bbl_command_injections(mod_name: str = None, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
+    injections = BBInjectionRegistry().get_all_injections() + BBInjectionRegistry().get_pending_injections()
+    if mod_name is not None:
+        injections = tuple(injection for injection in injections if injection.mod_identity.mod_name.lower() == mod_name.lower())
+    if not injections:
+        output('No injections found.')
+        return
+    lines = list()
+    for injection in injections:
+        target_object_name = getattr(injection.target_object, '__name__', str(injection.target_object))
+        hook_name = getattr(injection.hook, '__qualname__', str(injection.hook))
+        pending_text = ' (waiting for import)' if injection.is_pending else ''
+        lines.append(f'{injection.order}: {injection.mod_identity.mod_name} {target_object_name}.{injection.target_name} -> {hook_name}{pending_text}')
+    for line in lines:
+        output(line)
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    log = BBLogRegistry().register_log(ModIdentity(), 'bb_injections')
+    log.debug('Injections:\n' + '\n'.join(lines), ignore_enabled=True)
+    output(f'SUCCESS: Listed {len(injections)} injection(s).')
+
+
+@Command(
+    'bbl.enable_injection_stats',
+    # 'Start counting the calls of injected functions and measuring the time spent inside them. Only every Nth call is timed. Export the results with bbl.injection_stats',
+    command_type=CommandType.Live
+)
+def _bbl_command_enable_injection_stats(sample_every: int = 1, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.utils.debug.bb_injection_profiler import BBInjectionProfiler
+    from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
+    profiler = BBInjectionRegistry().profiler
+    if profiler is None or profiler.sample_every != sample_every:
+        profiler = BBInjectionProfiler(sample_every=sample_every)
+    BBInjectionRegistry().enable_profiling(profiler)
+    output(f'Injection stats are now enabled, timing every {profiler.sample_every} call(s).')
+
+
+@Command(
+    'bbl.disable_injection_stats',
+    # 'Stop measuring injected functions. Stats already collected are kept.',
+    command_type=CommandType.Live
+)
+def _bbl_command_disable_injection_stats(_connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
+    if not BBInjectionRegistry().is_profiling:
+        output('Injection stats are already disabled.')
+        return
+    BBInjectionRegistry().disable_profiling()
+    output('Injection stats are now disabled.')
+
+
+@Command(
+    'bbl.injection_stats',
+    # 'Export the calls and times of injected functions to "The Sims 4/bb_logs/BluuberryLibrary_version_Injection_Stats.csv". Specify json as the file format to export JSON instead.',
+    command_type=CommandType.Live
+)
+def _bbl_command_injection_stats(file_format: str = 'csv', reset: bool = False, _connection: int = None):
+    from sims4.commands import CheatOutput
+    output = CheatOutput(_connection)
+    from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
+    profiler = BBInjectionRegistry().profiler
+    if profiler is None:
+        output('No injection stats have been collected. Enable them with bbl.enable_injection_stats')
+        return
+    file_format = file_format.lower()
+    if file_format == 'csv':
+        text = profiler.to_csv()
+    elif file_format == 'json':
+        text = profiler.to_json()
+    else:
+        output(f'ERROR: Unknown file format \'{file_format}\'. Use csv or json.')
+        return
+    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+    from bluuberrylibrary.utils.file.bb_file_utils import BBFileUtils
+    mod_identity = ModIdentity()
+    file_path = os.path.join(BBLogRegistry()._logging_folder_path(), f'{mod_identity.mod_name}_{mod_identity.mod_version}_Injection_Stats.{file_format}')
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if not BBFileUtils.write_file(file_path, text, ignore_errors=True, remove_if_exists=True):
+        output(f'FAILED: Failed to write injection stats to \'{file_path}\'.')
+        return
+    output(f'SUCCESS: Wrote the stats of {len(profiler.get_all_statistics())} injection(s) to \'{file_path}\'.')
+    if reset:
+        profiler.reset()
@@ -0,0 +1,89 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import sys
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Callable, Union
+
+
+class _BBInjectionLoader:
+    # Wraps the loader of a module so injections waiting for the module are made as soon as it has executed.
+    def __init__(self, loader: Any, on_module_loaded: Callable[[str], None]):
+        self._loader = loader
+        self._on_module_loaded = on_module_loaded
+
+    def create_module(self, spec: ModuleSpec) -> Union[ModuleType, None]:
+        create_module = getattr(self._loader, 'create_module', None)
+        if create_module is None:
+            return None
+        return create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._on_module_loaded(module.__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _BBInjectionLegacyLoader:
+    # Wraps a loader that only supports the legacy load_module protocol.
+    def __init__(self, loader: Any, on_module_loaded: Callable[[str], None]):
+        self._loader = loader
+        self._on_module_loaded = on_module_loaded
+
+    def load_module(self, fullname: str) -> ModuleType:
+        module = self._loader.load_module(fullname)
+        self._on_module_loaded(fullname)
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _BBInjectionImportFinder:
+    # Sits at the front of sys.meta_path while injections are waiting for modules to be imported.
+    # It never loads modules itself, it asks the other finders and wraps the loader they return.
+    def __init__(self, is_module_awaited: Callable[[str], bool], on_module_loaded: Callable[[str], None]):
+        self._is_module_awaited = is_module_awaited
+        self._on_module_loaded = on_module_loaded
+
+    @property
+    def is_installed(self) -> bool:
+        return self in sys.meta_path
+
+    def install(self) -> None:
+        if not self.is_installed:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self.is_installed:
+            sys.meta_path.remove(self)
+
+    # noinspection PyUnusedLocal
+    def find_spec(self, fullname: str, path: Any = None, target: ModuleType = None) -> Union[ModuleSpec, None]:
+        if not self._is_module_awaited(fullname):
+            return None
+        for finder in tuple(sys.meta_path):
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            if loader is None:
+                return spec
+            if hasattr(loader, 'exec_module'):
+                spec.loader = _BBInjectionLoader(loader, self._on_module_loaded)
+            elif hasattr(loader, 'load_module'):
+                spec.loader = _BBInjectionLegacyLoader(loader, self._on_module_loaded)
+            return spec
+        return None
@@ -0,0 +1,235 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import csv
+import io
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class BBInjectionStatistics:
+    """BBInjectionStatistics(mod_name, target_name, hook_name, sample_every=1, clock=time.perf_counter)
+
+    Call counts and timing information gathered for a single injection.
+
+    :param mod_name: The name of the mod that owns the injection.
+    :type mod_name: str
+    :param target_name: The name of the injected attribute, including the name of the object containing it.
+    :type target_name: str
+    :param hook_name: The qualified name of the injected function.
+    :type hook_name: str
+    :param sample_every: Only every Nth call is timed. Default is 1.
+    :type sample_every: int, optional
+    :param clock: A function returning the current time in seconds. Default is time.perf_counter.
+    :type clock: Callable[[], float], optional
+    """
+    def __init__(self, mod_name: str, target_name: str, hook_name: str, sample_every: int = 1, clock: Callable[[], float] = time.perf_counter):
+        self._mod_name = mod_name
+        self._target_name = target_name
+        self._hook_name = hook_name
+        self._sample_every = max(1, sample_every)
+        self._clock = clock
+        self._call_count = 0
+        self._sampled_call_count = 0
+        self._hook_time = 0.0
+        self._original_time = 0.0
+
+    @property
+    def mod_name(self) -> str:
+        """The name of the mod that owns the injection."""
+        return self._mod_name
+
+    @property
+    def target_name(self) -> str:
+        """The name of the injected attribute, including the name of the object containing it."""
+        return self._target_name
+
+    @property
+    def hook_name(self) -> str:
+        """The qualified name of the injected function."""
+        return self._hook_name
+
+    @property
+    def call_count(self) -> int:
+        """The number of times the injected function was invoked. Each timed call counts for itself and the calls that were not timed after it."""
+        return self._call_count
+
+    @property
+    def sampled_call_count(self) -> int:
+        """The number of calls that were timed."""
+        return self._sampled_call_count
+
+    @property
+    def hook_time(self) -> float:
+        """The time spent inside the injected function during timed calls, excluding the original, in seconds."""
+        return self._hook_time
+
+    @property
+    def original_time(self) -> float:
+        """The time spent inside the original function during timed calls, in seconds."""
+        return self._original_time
+
+    @property
+    def estimated_hook_time(self) -> float:
+        """The time spent inside the injected function during all calls, excluding the original, estimated from the timed calls, in seconds."""
+        if not self._sampled_call_count:
+            return 0.0
+        return self._hook_time * self._call_count / self._sampled_call_count
+
+    @property
+    def mean_hook_time(self) -> float:
+        """The average time spent inside the injected function per call, excluding the original, in seconds."""
+        if not self._sampled_call_count:
+            return 0.0
+        return self._hook_time / self._sampled_call_count
+
+    @property
+    def mean_original_time(self) -> float:
+        """The average time spent inside the original function per call, in seconds."""
+        if not self._sampled_call_count:
+            return 0.0
+        return self._original_time / self._sampled_call_count
+
+    def reset(self) -> None:
+        """reset()
+
+        Discard the recorded calls and times.
+        """
+        self._call_count = 0
+        self._sampled_call_count = 0
+        self._hook_time = 0.0
+        self._original_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """to_dict()
+
+        Convert the statistics to a dictionary.
+
+        :return: The statistics as a dictionary, with times in milliseconds.
+        :rtype: Dict[str, Any]
+        """
+        return {
+            'mod_name': self._mod_name,
+            'target_name': self._target_name,
+            'hook_name': self._hook_name,
+            'call_count': self._call_count,
+            'sampled_call_count': self._sampled_call_count,
+            'hook_time_ms': self._hook_time * 1000,
+            'estimated_hook_time_ms': self.estimated_hook_time * 1000,
+            'mean_hook_time_ms': self.mean_hook_time * 1000,
+            'original_time_ms': self._original_time * 1000,
+            'mean_original_time_ms': self.mean_original_time * 1000
+        }
+
+
+def _call_timed_hook(statistics: BBInjectionStatistics, timed_link: Callable[..., Any], *args, **kwargs) -> Any:
+    clock = statistics._clock
+    original_time = statistics._original_time
+    start_time = clock()
+    try:
+        return timed_link(*args, **kwargs)
+    finally:
+        elapsed_time = clock() - start_time
+        # Counts this call and the calls made until the next timed call, which are not counted.
+        statistics._call_count += statistics._sample_every
+        statistics._sampled_call_count += 1
+        statistics._hook_time += elapsed_time - (statistics._original_time - original_time)
+
+
+def _call_timed_original(statistics: BBInjectionStatistics, original: Callable[..., Any], *args, **kwargs) -> Any:
+    clock = statistics._clock
+    start_time = clock()
+    try:
+        return original(*args, **kwargs)
+    finally:
+        statistics._original_time += clock() - start_time
+
+
+class BBInjectionProfiler:
+    """BBInjectionProfiler(sample_every=1, clock=time.perf_counter)
+
+    Counts the calls of injected functions and measures the time spent inside them and inside the functions they were injected into.
+
+    .. note:: Enable it via :func:`~BBInjectionRegistry.enable_profiling` or the `bbl.enable_injection_stats` command.
+
+    :param sample_every: Only every Nth call of an injected function is timed, which keeps the cost of profiling frequently invoked functions low. The calls that are not timed go through the injected functions as if profiling was disabled and are counted in bulk. Default is 1.
+    :type sample_every: int, optional
+    :param clock: A function returning the current time in seconds. Default is time.perf_counter.
+    :type clock: Callable[[], float], optional
+    """
+    def __init__(self, sample_every: int = 1, clock: Callable[[], float] = time.perf_counter):
+        self._sample_every = max(1, sample_every)
+        self._clock = clock
+        self._statistics: Dict[Tuple[Any, ...], BBInjectionStatistics] = dict()
+
+    @property
+    def sample_every(self) -> int:
+        """Only every Nth call of an injected function is timed."""
+        return self._sample_every
+
+    def get_statistics(self, injection) -> BBInjectionStatistics:
+        """get_statistics(injection)
+
+        Retrieve the statistics recorded for an injection.
+
+        :param injection: The injection.
+        :type injection: BBInjection
+        :return: The statistics of the injection.
+        :rtype: BBInjectionStatistics
+        """
+        key = injection._get_key()
+        statistics = self._statistics.get(key, None)
+        if statistics is None:
+            target_name = '{}.{}'.format(getattr(injection.target_object, '__name__', injection.target_object), injection.target_name)
+            hook_name = getattr(injection.hook, '__qualname__', str(injection.hook))
+            statistics = BBInjectionStatistics(injection.mod_identity.mod_name, target_name, hook_name, sample_every=self._sample_every, clock=self._clock)
+            self._statistics[key] = statistics
+        return statistics
+
+    def get_all_statistics(self) -> List[BBInjectionStatistics]:
+        """get_all_statistics()
+
+        Retrieve the statistics of all injections, the injections that took the most time first.
+
+        :return: A list of statistics.
+        :rtype: List[BBInjectionStatistics]
+        """
+        return sorted(self._statistics.values(), key=lambda statistics: statistics.estimated_hook_time, reverse=True)
+
+    def reset(self) -> None:
+        """reset()
+
+        Discard all recorded statistics.
+        """
+        for statistics in self._statistics.values():
+            statistics.reset()
+
+    def to_csv(self) -> str:
+        """to_csv()
+
+        Format the recorded statistics as comma separated values, the injections that took the most time first.
+
+        :return: The statistics as CSV, with a header row.
+        :rtype: str
+        """
+        rows = [statistics.to_dict() for statistics in self.get_all_statistics()]
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(BBInjectionStatistics('', '', '').to_dict().keys()), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue()
+
+    def to_json(self) -> str:
+        """to_json()
+
+        Format the recorded statistics as JSON, the injections that took the most time first.
+
+        :return: The statistics as a JSON list.
+        :rtype: str
+        """
+        return json.dumps([statistics.to_dict() for statistics in self.get_all_statistics()], indent=2)
@@ -0,0 +1,690 @@
+"""
+This mod is licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) BLUUBERRYBONANZA
+"""
+import sys
+from functools import partial, update_wrapper
+from itertools import count
+from types import FunctionType
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from bluuberrylibrary.classes.bb_singleton import BBSingleton
+from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
+from bluuberrylibrary.utils.debug.bb_injection_import_finder import _BBInjectionImportFinder
+from bluuberrylibrary.utils.debug.bb_injection_profiler import BBInjectionProfiler, _call_timed_hook, _call_timed_original
+from sims4.utils import flexmethod
+
+# The kinds of attributes injections can target. They decide how the original is invoked and how the trampoline is installed.
+_FUNCTION = 'function'
+_CLASS_METHOD = 'classmethod'
+_STATIC_METHOD = 'staticmethod'
+_FLEX_METHOD = 'flexmethod'
+_PROPERTY = 'property'
+
+
+class BBInjection:
+    """BBInjection(mod_identity, target_object, target_name, hook, log_errors=True, order=0, fast_path=False, enabled_when=None, cache_keys=None)
+
+    A function injected into an attribute of an object.
+
+    .. note:: Injections are created by the :class:`.BBInjectionRegistry`, usually through :func:`~BBInjectionUtils.inject`.
+
+    :param mod_identity: The identity of the mod that injected the function.
+    :type mod_identity: BBModIdentity
+    :param target_object: The object containing the attribute.
+    :type target_object: Any
+    :param target_name: The name of the attribute.
+    :type target_name: str
+    :param hook: The injected function. It receives the original function as its first argument.
+    :type hook: Callable[..., Any]
+    :param log_errors: If True, errors raised by the hook are logged and the original function is invoked instead. Default is True.
+    :type log_errors: bool, optional
+    :param order: The position of the injection among all injections, the lowest first. Default is 0.
+    :type order: int, optional
+    :param fast_path: If True, the original function given to the hook of a class or flex method expects cls (and inst) to be passed explicitly. Default is False.
+    :type fast_path: bool, optional
+    :param enabled_when: A function determining if the hook is invoked. It is checked when the injections of the registry are refreshed, not on every call. If None, the hook is always invoked. Default is None.
+    :type enabled_when: Callable[[], bool], optional
+    :param cache_keys: The names of the attributes the value returned by the hook of a property depends on. If specified, the value is cached per instance until one of those attributes changes. Default is None.
+    :type cache_keys: Iterable[str], optional
+    """
+    def __init__(self, mod_identity: BBModIdentity, target_object: Any, target_name: str, hook: Callable[..., Any], log_errors: bool = True, order: int = 0, fast_path: bool = False, enabled_when: Callable[[], bool] = None, cache_keys: Iterable[str] = None):
+        self._mod_identity = mod_identity
+        self._target_object = target_object
+        self._target_name = target_name
+        self._hook = hook
+        self._log_errors = log_errors
+        self._order = order
+        self._fast_path = fast_path
+        self._enabled_when = enabled_when
+        self._cache_keys: Tuple[str, ...] = tuple(cache_keys) if cache_keys else tuple()
+        self._is_pending = False
+        self._injection_target: '_BBInjectionTarget' = None
+
+    @property
+    def mod_identity(self) -> BBModIdentity:
+        """The identity of the mod that injected the function."""
+        return self._mod_identity
+
+    @property
+    def target_object(self) -> Any:
+        """The object containing the attribute or its dotted path while the injection is pending."""
+        return self._target_object
+
+    @property
+    def target_name(self) -> str:
+        """The name of the attribute."""
+        return self._target_name
+
+    @property
+    def hook(self) -> Callable[..., Any]:
+        """The injected function."""
+        return self._hook
+
+    @property
+    def log_errors(self) -> bool:
+        """True, if errors raised by the hook are logged and the original function is invoked instead. False, if not."""
+        return self._log_errors
+
+    @property
+    def order(self) -> int:
+        """The position of the injection among all injections, the lowest first."""
+        return self._order
+
+    @property
+    def fast_path(self) -> bool:
+        """True, if the original function given to the hook of a class or flex method expects cls (and inst) to be passed explicitly. False, if not."""
+        return self._fast_path
+
+    @property
+    def enabled_when(self) -> Union[Callable[[], bool], None]:
+        """A function determining if the hook is invoked or None if the hook is always invoked."""
+        return self._enabled_when
+
+    @property
+    def cache_keys(self) -> Tuple[str, ...]:
+        """The names of the attributes the cached value of a property hook depends on. Empty, if the value is not cached."""
+        return self._cache_keys
+
+    @property
+    def is_enabled(self) -> bool:
+        """True, if the hook should be invoked according to its enabled_when function. False, if not."""
+        if self._enabled_when is None:
+            return True
+        # noinspection PyBroadException
+        try:
+            return bool(self._enabled_when())
+        except Exception as ex:
+            self._log_error(ex)
+            return True
+
+    @property
+    def original(self) -> Callable[..., Any]:
+        """The function the attribute held before any injection was made into it."""
+        if self._injection_target is None:
+            return None
+        return self._injection_target.original
+
+    @property
+    def is_pending(self) -> bool:
+        """True, if the injection is waiting for the module containing its target to be imported. False, if not."""
+        return self._is_pending
+
+    @property
+    def is_active(self) -> bool:
+        """True, if the hook is invoked when the attribute is. False, if the injection was removed."""
+        return self._injection_target is not None
+
+    def _log_error(self, exception: Exception) -> None:
+        # noinspection PyBroadException
+        try:
+            from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
+            BBLogRegistry().register_log(self._mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(getattr(self._hook, '__name__', self._hook), getattr(self._target_object, '__name__', self._target_object)), exception=exception)
+        except Exception:
+            pass
+
+    def _get_key(self) -> Tuple[Any, str, str, str, str]:
+        # Identifies the hook across script reloads, when the same function is defined again as a new object.
+        return self._target_object, self._target_name, self._mod_identity.mod_name, getattr(self._hook, '__module__', None), getattr(self._hook, '__qualname__', repr(self._hook))
+
+    def __repr__(self) -> str:
+        return '<BBInjection: {} {}.{} -> {}>'.format(self._mod_identity.mod_name, getattr(self._target_object, '__name__', self._target_object), self._target_name, getattr(self._hook, '__qualname__', self._hook))
+
+
+def _call_class_hook(hook: Callable[..., Any], previous: Callable[..., Any], bound_previous_by_class: Dict[type, partial], cls, *args, **kwargs) -> Any:
+    bound_previous = bound_previous_by_class.get(cls, None)
+    if bound_previous is None:
+        bound_previous = partial(previous, cls)
+        bound_previous_by_class[cls] = bound_previous
+    return hook(bound_previous, cls, *args, **kwargs)
+
+
+def _call_flex_hook(hook: Callable[..., Any], previous: Callable[..., Any], bound_previous_by_class: Dict[type, partial], cls, inst, *args, **kwargs) -> Any:
+    if inst is not None:
+        return hook(partial(previous, cls, inst), cls, inst, *args, **kwargs)
+    bound_previous = bound_previous_by_class.get(cls, None)
+    if bound_previous is None:
+        bound_previous = partial(previous, cls, None)
+        bound_previous_by_class[cls] = bound_previous
+    return hook(bound_previous, cls, inst, *args, **kwargs)
+
+
+def _call_guarded_hook(injection: BBInjection, link: Callable[..., Any], previous: Callable[..., Any], *args, **kwargs) -> Any:
+    try:
+        return link(*args, **kwargs)
+    except Exception as ex:
+        injection._log_error(ex)
+        return previous(*args, **kwargs)
+
+
+def _call_cached_property_hook(link: Callable[..., Any], cache_name: str, get_cache_key: Callable[[Any], Any], self) -> Any:
+    # The cached value is stored alongside the link that computed it, so values cached by a previous chain are never returned.
+    try:
+        instance_dict = self.__dict__
+        cache_key = get_cache_key(self)
+    except AttributeError:
+        return link(self)
+    cached = instance_dict.get(cache_name, None)
+    if cached is not None and cached[0] is link and cached[1] == cache_key:
+        return cached[2]
+    value = link(self)
+    instance_dict[cache_name] = (link, cache_key, value)
+    return value
+
+
+def _resolve_target_path(target_path: str) -> Any:
+    # Resolves the dotted path of an object using the longest prefix that is an imported module.
+    # None is returned while the module, or a submodule along the path, has not been imported yet.
+    path_parts = target_path.split('.')
+    for module_part_count in range(len(path_parts), 0, -1):
+        module = sys.modules.get('.'.join(path_parts[:module_part_count]), None)
+        if module is None:
+            continue
+        target_object = module
+        for attribute_name in path_parts[module_part_count:]:
+            target_object = getattr(target_object, attribute_name, None)
+            if target_object is None:
+                return None
+        return target_object
+    return None
+
+
+def _get_own_attribute(target_object: Any, target_name: str) -> Any:
+    try:
+        return vars(target_object).get(target_name, None)
+    except TypeError:
+        return getattr(target_object, target_name, None)
+
+
+class _BBInjectionTarget:
+    # The attribute of an object that injections were made into, along with its single trampoline.
+    #
+    # Every link of the chain takes the arguments the trampoline was called with, including cls and inst for class and flex methods.
+    # The chain is rebuilt whenever its injections change, so calling the attribute costs one trampoline frame plus one frame per hook.
+    # Hooks of class and flex methods expect an original with cls (and inst) already bound. Those bound originals are cached per class,
+    # except for flex methods called on an instance. Fast path hooks receive the link itself, so their calls allocate nothing.
+    def __init__(self, target_object: Any, target_name: str):
+        self.target_object = target_object
+        self.target_name = target_name
+        self.kind = _FUNCTION
+        self.original: Callable[..., Any] = None
+        # The property the getter was taken from, its setter and deleter are kept when the trampoline is installed.
+        self.original_property: property = None
+        # The attribute found on the object itself before the trampoline was installed or None if it was inherited.
+        self.original_attribute: Any = None
+        self.injections: List[BBInjection] = list()
+        self.chain: Callable[..., Any] = None
+        # While profiling, a second chain that times every hook, which the trampoline calls once every sample_every calls.
+        self.profiled_chain: Callable[..., Any] = None
+        self.sample_every = 1
+        self.installed_attribute: Any = None
+
+    @property
+    def is_installed(self) -> bool:
+        return self.installed_attribute is not None and _get_own_attribute(self.target_object, self.target_name) is self.installed_attribute
+
+    @property
+    def is_replaced(self) -> bool:
+        # The trampoline was replaced outside of the registry.
+        return self.installed_attribute is not None and not self.is_installed
+
+    def _capture_original(self) -> None:
+        target_object = self.target_object
+        target_name = self.target_name
+        static_attribute = None
+        if isinstance(target_object, type):
+            for owner in target_object.__mro__:
+                if target_name in vars(owner):
+                    static_attribute = vars(owner)[target_name]
+                    break
+        self.original_attribute = _get_own_attribute(target_object, target_name)
+        self.original_property = None
+        if isinstance(static_attribute, classmethod):
+            self.kind = _CLASS_METHOD
+            self.original = static_attribute.__func__
+        elif isinstance(static_attribute, staticmethod):
+            self.kind = _STATIC_METHOD
+            self.original = static_attribute.__func__
+        elif isinstance(static_attribute, flexmethod):
+            self.kind = _FLEX_METHOD
+            self.original = static_attribute.func
+        elif isinstance(static_attribute, property):
+            self.kind = _PROPERTY
+            self.original = static_attribute.fget
+            self.original_property = static_attribute
+        elif isinstance(static_attribute, FunctionType):
+            self.original = static_attribute
+        else:
+            self.original = getattr(target_object, target_name)
+
+    def add_injection(self, injection: BBInjection) -> None:
+        injection._injection_target = self
+        self.injections.append(injection)
+        self.refresh()
+
+    def replace_injection(self, old_injection: BBInjection, new_injection: BBInjection) -> None:
+        old_injection._injection_target = None
+        new_injection._injection_target = self
+        self.injections[self.injections.index(old_injection)] = new_injection
+        self.refresh()
+
+    def remove_injection(self, injection: BBInjection) -> None:
+        injection._injection_target = None
+        self.injections.remove(injection)
+        self.refresh()
+
+    def refresh(self) -> None:
+        # The trampoline is only installed while at least one hook is enabled, so the attribute costs nothing otherwise.
+        enabled_injections = [injection for injection in self.injections if injection.is_enabled]
+        if self.is_replaced:
+            self.rebuild_chain(enabled_injections)
+            return
+        if not enabled_injections:
+            if self.is_installed:
+                self._restore_original()
+            self.rebuild_chain(enabled_injections)
+            return
+        if self.installed_attribute is None:
+            # The attribute may have changed while the original was in place.
+            self._capture_original()
+            self.rebuild_chain(enabled_injections)
+            self._install_trampoline()
+        else:
+            is_profiled = self.profiled_chain is not None
+            self.rebuild_chain(enabled_injections)
+            if is_profiled != (self.profiled_chain is not None):
+                # Profiling was enabled or disabled, the trampoline counting the calls is swapped in or out.
+                self._install_trampoline()
+
+    def _restore_original(self) -> None:
+        if self.original_attribute is None:
+            delattr(self.target_object, self.target_name)
+        else:
+            setattr(self.target_object, self.target_name, self.original_attribute)
+        self.installed_attribute = None
+
+    def rebuild_chain(self, injections: List[BBInjection]) -> None:
+        profiler = BBInjectionRegistry()._active_profiler
+        self.chain = self._build_chain(injections)
+        if profiler is None:
+            self.profiled_chain = None
+        else:
+            self.sample_every = profiler.sample_every
+            self.profiled_chain = self._build_chain(injections, profiler=profiler)
+
+    def _build_chain(self, injections: List[BBInjection], profiler: BBInjectionProfiler = None) -> Callable[..., Any]:
+        chain = self.original
+        for injection in injections:
+            if profiler is None:
+                link = self._create_link(injection, chain)
+            else:
+                # The hook is given an original that records the time spent below the hook.
+                statistics = profiler.get_statistics(injection)
+                link = partial(_call_timed_hook, statistics, self._create_link(injection, partial(_call_timed_original, statistics, chain)))
+            if injection.log_errors:
+                link = partial(_call_guarded_hook, injection, link, chain)
+            if self.kind == _PROPERTY and injection.cache_keys:
+                cache_name = '_bb_cached_{}_{}'.format(self.target_name, injection.order)
+                link = partial(_call_cached_property_hook, link, cache_name, attrgetter(*injection.cache_keys))
+            chain = link
+        return chain
+
+    def _create_link(self, injection: BBInjection, previous: Callable[..., Any]) -> Callable[..., Any]:
+        if self.kind == _CLASS_METHOD and not injection.fast_path:
+            return partial(_call_class_hook, injection.hook, previous, dict())
+        if self.kind == _FLEX_METHOD and not injection.fast_path:
+            return partial(_call_flex_hook, injection.hook, previous, dict())
+        return partial(injection.hook, previous)
+
+    def _install_trampoline(self) -> None:
+        injection_target = self
+
+        if self.profiled_chain is not None:
+            # Calls that are not timed cost a countdown, instead of a frame per hook.
+            countdown = 1
+
+            def _trampoline(*args, **kwargs) -> Any:
+                nonlocal countdown
+                countdown -= 1
+                if countdown:
+                    return injection_target.chain(*args, **kwargs)
+                countdown = injection_target.sample_every
+                # The trampoline may still be called after profiling was disabled, if it was replaced outside of the registry.
+                return (injection_target.profiled_chain or injection_target.chain)(*args, **kwargs)
+        elif self.kind == _CLASS_METHOD:
+            def _trampoline(cls, *args, **kwargs) -> Any:
+                return injection_target.chain(cls, *args, **kwargs)
+        elif self.kind == _FLEX_METHOD:
+            def _trampoline(cls, inst, *args, **kwargs) -> Any:
+                return injection_target.chain(cls, inst, *args, **kwargs)
+        else:
+            def _trampoline(*args, **kwargs) -> Any:
+                return injection_target.chain(*args, **kwargs)
+
+        # noinspection PyBroadException
+        try:
+            update_wrapper(_trampoline, self.original)
+        except Exception:
+            pass
+        _trampoline.__name__ = self.target_name
+
+        if self.kind == _CLASS_METHOD:
+            installed_attribute = classmethod(_trampoline)
+        elif self.kind == _STATIC_METHOD:
+            installed_attribute = staticmethod(_trampoline)
+        elif self.kind == _FLEX_METHOD:
+            installed_attribute = flexmethod(_trampoline)
+        elif self.kind == _PROPERTY:
+            original_property = self.original_property
+            installed_attribute = property(_trampoline, original_property.fset, original_property.fdel, original_property.__doc__)
+        else:
+            installed_attribute = _trampoline
+        setattr(self.target_object, self.target_name, installed_attribute)
+        self.installed_attribute = _get_own_attribute(self.target_object, self.target_name)
+
+
+class BBInjectionRegistry(metaclass=BBSingleton):
+    """A registry of the functions injected into the attributes of objects.
+
+    Every injected attribute is replaced only once, by a single trampoline function.
+    The injected functions are kept as an ordered list and compiled into a chain of calls whenever an injection is added, so calling an attribute injected by many mods does not go through a wrapper per injection.
+
+    .. note:: Injections are usually made through :func:`~BBInjectionUtils.inject`, which registers them here.
+
+    :Example usage:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        def _do_something_on_load_sim_info(original, self, *args, **kwargs):
+            return original(self, *args, **kwargs)
+
+        injection = BBInjectionRegistry().register_injection(ModIdentity(), SimInfo, 'load_sim_info', _do_something_on_load_sim_info)
+        # Later, restore the original behavior.
+        BBInjectionRegistry().uninject(injection)
+
+    Registering a hook again, for example after scripts were reloaded, replaces the previous hook with the same module and qualified name instead of invoking both.
+
+    The calls of injected functions and the time spent inside them can be measured while profiling is enabled. Chains are compiled without any timing code while it is disabled.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        profiler = BBInjectionRegistry().enable_profiling(BBInjectionProfiler(sample_every=10))
+        ...
+        BBInjectionRegistry().disable_profiling()
+        csv_text = profiler.to_csv()
+
+    Targets may be specified as dotted paths. The injection is then made the moment the module containing the target finishes importing, or immediately if it is already imported, so mods do not have to import the modules they inject into.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        BBInjectionRegistry().register_injection(ModIdentity(), 'sims.sim_spawner.SimSpawner', 'spawn_sim', _do_something_on_spawn_sim)
+
+    """
+    def __init__(self) -> None:
+        self._injection_targets: Dict[Tuple[Any, str], _BBInjectionTarget] = dict()
+        self._injections_by_key: Dict[Tuple[Any, str, str, str, str], BBInjection] = dict()
+        self._injection_counter = count(1)
+        # The profiler is kept after profiling is disabled so its statistics can still be viewed.
+        self._profiler: BBInjectionProfiler = None
+        self._active_profiler: BBInjectionProfiler = None
+        self._pending_injections: List[BBInjection] = list()
+        self._import_finder = _BBInjectionImportFinder(self._is_module_awaited, self._on_module_loaded)
+
+    @property
+    def profiler(self) -> Union[BBInjectionProfiler, None]:
+        """The profiler that measured injections most recently or None if profiling was never enabled."""
+        return self._profiler
+
+    @property
+    def is_profiling(self) -> bool:
+        """True, if the calls of injected functions are being measured. False, if not."""
+        return self._active_profiler is not None
+
+    def enable_profiling(self, profiler: BBInjectionProfiler = None) -> BBInjectionProfiler:
+        """enable_profiling(profiler=None)
+
+        Start counting the calls of injected functions and measuring the time spent inside them.
+
+        :param profiler: The profiler to record measurements with. If not specified, the current profiler is kept or a new one is created. Default is None.
+        :type profiler: BBInjectionProfiler, optional
+        :return: The profiler recording measurements.
+        :rtype: BBInjectionProfiler
+        """
+        if profiler is not None:
+            self._profiler = profiler
+        elif self._profiler is None:
+            self._profiler = BBInjectionProfiler()
+        self._active_profiler = self._profiler
+        self.refresh_injections()
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        """disable_profiling()
+
+        Stop measuring injected functions.
+        """
+        if self._active_profiler is None:
+            return
+        self._active_profiler = None
+        self.refresh_injections()
+
+    def refresh_injections(self) -> None:
+        """refresh_injections()
+
+        Check the enabled_when function of every injection again.
+
+        Attributes whose injections are all disabled get their original back, so calling them costs nothing extra. Their trampoline is installed again once an injection is enabled.
+
+        .. note:: Call this whenever the state checked by an enabled_when function changes.
+        """
+        # Includes the chains of attributes that were replaced outside of the registry, as those replacements may still invoke them.
+        injection_targets = {id(injection._injection_target): injection._injection_target for injection in self._injections_by_key.values()}
+        for injection_target in injection_targets.values():
+            injection_target.refresh()
+
+    def register_injection(self, mod_identity: BBModIdentity, target_object: Any, target_name: Union[str, None], hook: Callable[..., Any], log_errors: bool = True, fast_path: bool = False, enabled_when: Callable[[], bool] = None, cache_keys: Iterable[str] = None) -> BBInjection:
+        """register_injection(mod_identity, target_object, target_name, hook, log_errors=True, fast_path=False, enabled_when=None, cache_keys=None)
+
+        Inject a function into an attribute of an object.
+
+        .. note:: The most recently registered injection is invoked first and receives a function invoking the injection registered before it as its original.
+
+        .. note:: If the mod already injected a function with the same module and qualified name into the attribute, that function is replaced and keeps its place in the order.
+
+        :param mod_identity: The identity of the mod injecting the function.
+        :type mod_identity: BBModIdentity
+        :param target_object: The object containing the attribute, usually a class, or its dotted path, such as 'sims.sim_spawner.SimSpawner'.
+        :type target_object: Any
+        :param target_name: The name of the attribute. If None, target_object must be the dotted path of the attribute itself, such as 'sims.sim_spawner.SimSpawner.spawn_sim'.
+        :type target_name: str
+        :param hook: The function being injected. It receives the original function as its first argument.
+        :type hook: Callable[..., Any]
+        :param log_errors: If True, errors raised by the hook are logged and the original function is invoked instead. Default is True.
+        :type log_errors: bool, optional
+        :param fast_path: If True and the attribute is a class or flex method, the original function given to the hook expects cls (and inst) to be passed explicitly, which avoids binding them on every call. Default is False.
+        :type fast_path: bool, optional
+        :param enabled_when: A function determining if the hook is invoked. While it returns False, the hook is left out and the attribute holds its original when no other hooks are enabled. It is only checked when the injection is registered and when :func:`refresh_injections` is called. Default is None.
+        :type enabled_when: Callable[[], bool], optional
+        :param cache_keys: The names of the attributes the value returned by the hook of a property depends on, such as ('first_name', 'last_name'). If specified, the hook is only invoked again for an instance once the value of one of those attributes changes. It has no effect on attributes that are not properties. Default is None.
+        :type cache_keys: Iterable[str], optional
+        :return: The injection. It is pending until the module containing the target is imported when the target is a dotted path.
+        :rtype: BBInjection
+        """
+        if target_name is None:
+            (target_object, target_name) = target_object.rsplit('.', 1)
+        injection = BBInjection(mod_identity, target_object, target_name, hook, log_errors=log_errors, order=next(self._injection_counter), fast_path=fast_path, enabled_when=enabled_when, cache_keys=cache_keys)
+        if isinstance(target_object, str):
+            injection_key = injection._get_key()
+            for pending_injection in tuple(self._pending_injections):
+                if pending_injection._get_key() == injection_key:
+                    self._remove_pending_injection(pending_injection)
+            injection._is_pending = True
+            self._pending_injections.append(injection)
+            if not self._resolve_pending_injection(injection):
+                self._import_finder.install()
+            return injection
+        return self._apply_injection(injection)
+
+    def _apply_injection(self, injection: BBInjection) -> BBInjection:
+        target_object = injection.target_object
+        target_name = injection.target_name
+        injection_key = injection._get_key()
+        existing_injection = self._injections_by_key.get(injection_key, None)
+        if existing_injection is not None and existing_injection.is_active:
+            injection._order = existing_injection.order
+            existing_injection._injection_target.replace_injection(existing_injection, injection)
+            self._injections_by_key[injection_key] = injection
+            return injection
+        key = (target_object, target_name)
+        injection_target = self._injection_targets.get(key, None)
+        if injection_target is None or injection_target.is_replaced:
+            # The attribute was replaced outside of the registry, so the replacement becomes the original of a new chain.
+            injection_target = _BBInjectionTarget(target_object, target_name)
+            self._injection_targets[key] = injection_target
+        injection_target.add_injection(injection)
+        self._injections_by_key[injection_key] = injection
+        return injection
+
+    def uninject(self, injection: BBInjection) -> bool:
+        """uninject(injection)
+
+        Remove an injection. Once no injections remain in an attribute, its original is restored.
+
+        :param injection: The injection to remove.
+        :type injection: BBInjection
+        :return: True, if the injection was removed. False, if it was already removed.
+        :rtype: bool
+        """
+        if injection.is_pending:
+            self._remove_pending_injection(injection)
+            return True
+        if not injection.is_active:
+            return False
+        injection_target = injection._injection_target
+        injection_target.remove_injection(injection)
+        injection_key = injection._get_key()
+        if self._injections_by_key.get(injection_key, None) is injection:
+            del self._injections_by_key[injection_key]
+        key = (injection.target_object, injection.target_name)
+        if not injection_target.injections and self._injection_targets.get(key, None) is injection_target:
+            del self._injection_targets[key]
+        return True
+
+    def uninject_all(self, mod_identity: BBModIdentity) -> int:
+        """uninject_all(mod_identity)
+
+        Remove all injections made by a mod.
+
+        :param mod_identity: The identity of the mod.
+        :type mod_identity: BBModIdentity
+        :return: The number of injections removed.
+        :rtype: int
+        """
+        mod_name = mod_identity.mod_name
+        removed_count = 0
+        for injection in tuple(self._pending_injections):
+            if injection.mod_identity.mod_name == mod_name and self.uninject(injection):
+                removed_count += 1
+        for injection in reversed(self.get_all_injections()):
+            if injection.mod_identity.mod_name == mod_name and self.uninject(injection):
+                removed_count += 1
+        return removed_count
+
+    def get_all_injections(self) -> Tuple[BBInjection, ...]:
+        """get_all_injections()
+
+        Retrieve all active injections.
+
+        :return: The injections, in the order they were registered.
+        :rtype: Tuple[BBInjection, ...]
+        """
+        return tuple(sorted(self._injections_by_key.values(), key=lambda injection: injection.order))
+
+    def get_pending_injections(self) -> Tuple[BBInjection, ...]:
+        """get_pending_injections()
+
+        Retrieve the injections waiting for the modules containing their targets to be imported.
+
+        :return: The pending injections, in the order they were registered.
+        :rtype: Tuple[BBInjection, ...]
+        """
+        return tuple(self._pending_injections)
+
+    def _remove_pending_injection(self, injection: BBInjection) -> None:
+        injection._is_pending = False
+        self._pending_injections.remove(injection)
+        if not self._pending_injections:
+            self._import_finder.uninstall()
+
+    def _resolve_pending_injection(self, injection: BBInjection) -> bool:
+        target_object = _resolve_target_path(injection.target_object)
+        if target_object is None:
+            return False
+        self._remove_pending_injection(injection)
+        injection._target_object = target_object
+        self._apply_injection(injection)
+        return True
+
+    def _is_module_awaited(self, module_name: str) -> bool:
+        module_prefix = module_name + '.'
+        for injection in self._pending_injections:
+            target_path = injection.target_object
+            if target_path == module_name or target_path.startswith(module_prefix):
+                return True
+        return False
+
+    def _on_module_loaded(self, module_name: str) -> None:
+        module_prefix = module_name + '.'
+        for injection in tuple(self._pending_injections):
+            target_path = injection.target_object
+            if target_path != module_name and not target_path.startswith(module_prefix):
+                continue
+            # noinspection PyBroadException
+            try:
+                self._resolve_pending_injection(injection)
+            except Exception as ex:
+                injection._log_error(ex)
+
+    def get_injections(self, target_object: Any, target_name: str) -> Tuple[BBInjection, ...]:
+        """get_injections(target_object, target_name)
+
+        Retrieve the injections made into an attribute of an object.
+
+        :param target_object: The object containing the attribute.
+        :type target_object: Any
+        :param target_name: The name of the attribute.
+        :type target_name: str
+        :return: The injections, in the order they were registered.
+        :rtype: Tuple[BBInjection, ...]
+        """
+        injection_target = self._injection_targets.get((target_object, target_name), None)
+        if injection_target is None:
+            return tuple()
+        return tuple(injection_target.injections)
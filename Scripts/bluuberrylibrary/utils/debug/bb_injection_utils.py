@@ -6,57 +6,28 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 Copyright (c) BLUUBERRYBONANZA
 """
 import os
-from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 from bluuberrylibrary.mod_registration.bb_mod_identity import BBModIdentity
-from sims4.utils import flexmethod
+from bluuberrylibrary.utils.debug.bb_injection_registry import BBInjectionRegistry
 
 ON_RTD = os.environ.get('READTHEDOCS', None) == 'True'
 
 
-class _ClassForTypeChecking:
-    @classmethod
-    def class_method(cls):
-        pass
-
-    def self_method(self):
-        pass
-
-    # noinspection PyMethodParameters
-    @flexmethod
-    def flex_method(cls, inst):
-        pass
-
-    # noinspection PyPropertyDefinition
-    @property
-    def property_type(self):
-        pass
-
-    @staticmethod
-    def static_method():
-        pass
-
-
-ClassMethodType = type(_ClassForTypeChecking.class_method)
-SelfMethodType = type(_ClassForTypeChecking.self_method)
-StaticMethodType = type(_ClassForTypeChecking.static_method)
-FlexMethodType = type(_ClassForTypeChecking.flex_method)
-PropertyType = type(_ClassForTypeChecking.property_type)
-
-
 class BBInjectionUtils:
     """Utilities to inject custom functionality into functions.
 
     """
     @staticmethod
-    def inject(mod_identity: BBModIdentity, target_object: Any, target_name: str, log_errors: bool = True) -> Callable:
-        """inject(mod_identity, target_object, target_name, log_errors=True)
+    def inject(mod_identity: BBModIdentity, target_object: Any, target_name: str = None, log_errors: bool = True, fast_path: bool = False, enabled_when: Callable[[], bool] = None, cache_keys: Iterable[str] = None) -> Callable:
+        """inject(mod_identity, target_object, target_name=None, log_errors=True, fast_path=False, enabled_when=None, cache_keys=None)
 
         A decorator used to inject code into a function.
         It will run the original function should any problems occur.
         If log_errors is True, it will catch and log exceptions.
 
+        .. note:: Injections are kept by the :class:`.BBInjectionRegistry`, which replaces the target function only once no matter how many mods inject into it.
+
         :Example of cls usage:
 
         .. highlight:: python
@@ -67,6 +38,26 @@ class BBInjectionUtils:
             def do_something_on_spawn_sim(original, cls, *args, **kwargs):
                 return original(*args, **kwargs)
 
+        :Example of fast path cls usage:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            # Fast path cls usage, the original expects cls
+            @BBInjectionUtils.inject(ModIdentity(), SimSpawner, SimSpawner.spawn_sim.__name__, fast_path=True)
+            def do_something_on_spawn_sim(original, cls, *args, **kwargs):
+                return original(cls, *args, **kwargs)
+
+        :Example of usage without importing the target:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            # The injection is made once 'sims.sim_spawner' is imported by the game.
+            @BBInjectionUtils.inject(ModIdentity(), 'sims.sim_spawner.SimSpawner.spawn_sim')
+            def do_something_on_spawn_sim(original, cls, *args, **kwargs):
+                return original(*args, **kwargs)
+
         :Example of self usage:
 
         .. highlight:: python
@@ -77,11 +68,21 @@ class BBInjectionUtils:
             def do_something_on_load_sim_info(original, self, *args, **kwargs):
                 return original(self, *args, **kwargs)
 
+        :Example of cached property usage:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            # The full name is only built again once the first or last name of the Sim changes.
+            @BBInjectionUtils.inject(ModIdentity(), SimInfo, 'full_name', cache_keys=('first_name', 'last_name'))
+            def do_something_on_full_name(original, self):
+                return original(self)
+
         .. note::
 
            Injection WILL work on
 
-           - Functions decorated with 'property'
+           - Functions decorated with 'property', their setter and deleter are kept as they are
            - Functions decorated with 'classmethod'
            - Functions decorated with 'staticmethod'
            - Functions decorated with 'flexmethod'
@@ -99,12 +100,18 @@ class BBInjectionUtils:
 
         :param mod_identity: The identity of the Mod that is injecting custom code.
         :type mod_identity: BBModIdentity
-        :param target_object: The class that contains the target function.
+        :param target_object: The class that contains the target function, or its dotted path such as 'sims.sim_spawner.SimSpawner'. When a dotted path is specified, the injection is made as soon as the module containing the class is imported.
         :type target_object: Any
-        :param target_name: The name of the function being injected to.
-        :type target_name: str
+        :param target_name: The name of the function being injected to. If not specified, target_object must be the dotted path of the function itself, such as 'sims.sim_spawner.SimSpawner.spawn_sim'. Default is None.
+        :type target_name: str, optional
         :param log_errors: If set to True, any errors thrown by the wrapped function will be handled by your mod. If set to False, any errors thrown by the wrapped function will not be caught. Default is True.
         :type log_errors: bool, optional
+        :param fast_path: If set to True and the target is a 'classmethod' or 'flexmethod', the original function expects 'cls' (and 'inst') to be passed explicitly, for example original(cls, *args, **kwargs). This avoids binding them on every call of frequently invoked functions. It has no effect on other functions. Default is False.
+        :type fast_path: bool, optional
+        :param enabled_when: A function determining if the injected code should run. While it returns False, the target function is put back in place and runs without any extra cost. It is only checked when injecting and when :func:`~BBInjectionRegistry.refresh_injections` is called, so call that whenever its result changes. Default is None.
+        :type enabled_when: Callable[[], bool], optional
+        :param cache_keys: The names of the attributes the value returned by an injected 'property' depends on. If specified, the value is cached per instance and the injected code only runs again once one of those attributes changes. It has no effect on other functions. Default is None.
+        :type cache_keys: Iterable[str], optional
         :return: A wrapped function.
         :rtype: Callable
         """
@@ -113,194 +120,8 @@ class BBInjectionUtils:
                 return wrap_function
             return _injected
 
-        if log_errors:
-            def _function_wrapper(original_function, new_function: Callable[..., Any]) -> Any:
-                # noinspection PyBroadException
-                try:
-                    # @classmethod
-                    if isinstance(original_function, ClassMethodType):
-                        original_function_func = original_function.__func__
-
-                        # noinspection PyDecorator
-                        @wraps(original_function)
-                        def _wrapped_class_function(cls, *args, **kwargs) -> Any:
-                            try:
-                                def _do_original(*_, **__):
-                                    return original_function_func(cls, *_, **__)
-
-                                return new_function(_do_original, cls, *args, **kwargs)
-                            except Exception as ex:
-                                # noinspection PyBroadException
-                                try:
-                                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                    BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                                except Exception:
-                                    pass
-                                return original_function_func(cls, *args, **kwargs)
-
-                        return classmethod(_wrapped_class_function)
-
-                    # self method
-                    if isinstance(original_function, SelfMethodType):
-                        @wraps(original_function)
-                        def _wrapped_self_function(self, *args, **kwargs) -> Any:
-                            try:
-                                return new_function(original_function, self, *args, **kwargs)
-                            except Exception as ex:
-                                # noinspection PyBroadException
-                                try:
-                                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                    BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                                except Exception:
-                                    pass
-                                return original_function(self, *args, **kwargs)
-
-                        return _wrapped_self_function
-
-                    # @property
-                    if isinstance(original_function, PropertyType):
-                        # noinspection PyTypeChecker
-                        @wraps(original_function)
-                        def _wrapped_property_function(self, *args, **kwargs) -> Any:
-                            try:
-                                return new_function(original_function.fget, self, *args, **kwargs)
-                            except Exception as ex:
-                                # noinspection PyBroadException
-                                try:
-                                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                    BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                                except Exception:
-                                    pass
-                                return original_function(self, *args, **kwargs)
-
-                        return property(_wrapped_property_function)
-
-                    if isinstance(original_function, StaticMethodType):
-                        original_function_func = original_function.__func__
-
-                        # noinspection PyDecorator
-                        @wraps(original_function)
-                        def _wrapped_static_function(*args, **kwargs) -> Any:
-                            try:
-                                def _do_original(*_, **__):
-                                    return original_function_func(*_, **__)
-
-                                return new_function(_do_original, *args, **kwargs)
-                            except Exception as ex:
-                                # noinspection PyBroadException
-                                try:
-                                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                    BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                                except Exception:
-                                    pass
-                                return original_function_func(*args, **kwargs)
-
-                        return staticmethod(_wrapped_static_function)
-
-                    if isinstance(original_function, FlexMethodType):
-                        def _wrapped_flex_function(cls, inst, *args, **kwargs) -> Any:
-                            try:
-                                def _do_original(*_, **__):
-                                    return original_function.func(cls, inst, *_, **__)
-
-                                return new_function(_do_original, cls, inst, *args, **kwargs)
-                            except Exception as ex:
-                                # noinspection PyBroadException
-                                try:
-                                    from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                    BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                                except Exception:
-                                    pass
-                                return original_function.func(cls, inst, *args, **kwargs)
-
-                        _wrapped_flex_function.__name__ = target_name
-
-                        return flexmethod(_wrapped_flex_function)
-
-                    # Other thing
-                    @wraps(original_function)
-                    def _wrapped_function(*args, **kwargs) -> Any:
-                        try:
-                            return new_function(original_function, *args, **kwargs)
-                        except Exception as ex:
-                            # noinspection PyBroadException
-                            try:
-                                from bluuberrylibrary.logs.bb_log_registry import BBLogRegistry
-                                BBLogRegistry().register_log(mod_identity, 'bb_injection_utils').error('Error occurred in function \'{}\' of class \'{}\''.format(new_function.__name__, target_object.__name__), exception=ex)
-                            except Exception:
-                                pass
-                            return original_function(*args, **kwargs)
-
-                    return _wrapped_function
-                except:
-                    def _func(*_, **__) -> Any:
-                        pass
-                    return _func
-        else:
-            def _function_wrapper(original_function, new_function: Callable[..., Any]) -> Any:
-                # @classmethod
-                if isinstance(original_function, ClassMethodType):
-                    original_function_func = original_function.__func__
-
-                    # noinspection PyDecorator
-                    @wraps(original_function)
-                    def _wrapped_class_function(cls, *args, **kwargs) -> Any:
-                        def _do_original(*_, **__):
-                            return original_function_func(cls, *_, **__)
-
-                        return new_function(_do_original, cls, *args, **kwargs)
-
-                    return classmethod(_wrapped_class_function)
-
-                # self method
-                if isinstance(original_function, SelfMethodType):
-                    @wraps(original_function)
-                    def _wrapped_self_function(self, *args, **kwargs) -> Any:
-                        return new_function(original_function, self, *args, **kwargs)
-
-                    return _wrapped_self_function
-
-                # @property
-                if isinstance(original_function, PropertyType):
-                    # noinspection PyTypeChecker
-                    @wraps(original_function)
-                    def _wrapped_property_function(self, *args, **kwargs) -> Any:
-                        return new_function(original_function.fget, self, *args, **kwargs)
-
-                    return property(_wrapped_property_function)
-
-                if isinstance(original_function, StaticMethodType):
-                    original_function_func = original_function.__func__
-
-                    # noinspection PyDecorator
-                    @wraps(original_function)
-                    def _wrapped_static_function(*args, **kwargs) -> Any:
-                        def _do_original(*_, **__):
-                            return original_function_func(*_, **__)
-
-                        return new_function(_do_original, *args, **kwargs)
-
-                    return staticmethod(_wrapped_static_function)
-
-                if isinstance(original_function, FlexMethodType):
-                    def _wrapped_flex_function(cls, inst, *args, **kwargs) -> Any:
-                        def _do_original(*_, **__):
-                            return original_function.func(cls, inst, *_, **__)
-
-                        return new_function(_do_original, cls, inst, *args, **kwargs)
-
-                    _wrapped_flex_function.__name__ = target_name
-
-                    return flexmethod(_wrapped_flex_function)
-
-                @wraps(original_function)
-                def _wrapped_function(*args, **kwargs) -> Any:
-                    return new_function(original_function, *args, **kwargs)
-                return _wrapped_function
-
         def _injected(_wrap_function) -> Any:
-            _original_function = getattr(target_object, str(target_name))
-            setattr(target_object, str(target_name), _function_wrapper(_original_function, _wrap_function))
+            BBInjectionRegistry().register_injection(mod_identity, target_object, None if target_name is None else str(target_name), _wrap_function, log_errors=log_errors, fast_path=fast_path, enabled_when=enabled_when, cache_keys=cache_keys)
             return _wrap_function
 
         return _injected